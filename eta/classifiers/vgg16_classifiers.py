@@ -17,12 +17,27 @@ from builtins import *
 # pragma pylint: enable=unused-wildcard-import
 # pragma pylint: enable=wildcard-import
 
+import logging
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+import threading
+
 import numpy as np
+import tensorflow as tf
 
 from eta.core.config import Config
-import eta.core.data as etad
 import eta.core.learning as etal
-from eta.core.vgg16 import VGG16, VGG16Config
+import eta.core.utils as etau
+from eta.core.vgg16 import VGG16, VGG16Config, VGG16TFLite
+
+
+logger = logging.getLogger(__name__)
+
+
+# Process-level cache of loaded networks, shared by all VGG16Classifiers.
+# Maps keys to `_VGG16CacheEntry` instances
+_VGG16_CACHE = {}
+_VGG16_CACHE_LOCK = threading.Lock()
 
 
 class VGG16ClassifierConfig(Config):
@@ -32,6 +47,25 @@ class VGG16ClassifierConfig(Config):
         attr_name: the name of the attribute that the classifier predicts
         config: an `eta.core.vgg16.VGG16Config` specifying the model to use
         generate_features: whether to generate features for predictions
+        num_preprocessing_threads: the number of threads to use when
+            preprocessing images. By default, `min(8, cpu_count())` is used
+        quantization: an optional quantization mode to apply to the model.
+            Supported values are `eta.core.vgg16.VGG16TFLite.QUANTIZATIONS`.
+            Quantization requires TensorFlow 1.15 or later. By default, no
+            quantization is applied
+        keep_full_probs: whether to retain the full class distribution of the
+            last prediction so that it can be accessed via
+            `get_probabilities()`. If False, only the top-1 label and
+            confidence of each image are computed, and they are retained only
+            by the returned predictions. The default is True
+        batch_size: the (initial) number of images to process per forward
+            pass. By default, all images passed to `predict_all()` are
+            processed in a single pass, or 32 images per pass when
+            `autotune_batch_size` is True
+        autotune_batch_size: whether to automatically tune the batch size to
+            maximize throughput. The default is False
+        max_batch_size: the maximum batch size to use when autotuning. The
+            default is 256
     '''
 
     def __init__(self, d):
@@ -39,6 +73,17 @@ class VGG16ClassifierConfig(Config):
         self.config = self.parse_object(d, "config", VGG16Config, default=None)
         self.generate_features = self.parse_bool(
             d, "generate_features", default=False)
+        self.num_preprocessing_threads = self.parse_number(
+            d, "num_preprocessing_threads", default=None)
+        self.quantization = self.parse_categorical(
+            d, "quantization", VGG16TFLite.QUANTIZATIONS, default=None)
+        self.keep_full_probs = self.parse_bool(
+            d, "keep_full_probs", default=True)
+        self.batch_size = self.parse_number(d, "batch_size", default=None)
+        self.autotune_batch_size = self.parse_bool(
+            d, "autotune_batch_size", default=False)
+        self.max_batch_size = self.parse_number(
+            d, "max_batch_size", default=256)
 
 
 class VGG16Classifier(
@@ -48,8 +93,18 @@ class VGG16Classifier(
 
     Instances of this class must either use the context manager interface or
     manually call `close()` when finished to release memory.
+
+    The underlying network is shared by all instances in the process that use
+    the same model configuration, and it is only released when the last such
+    instance is closed.
     '''
 
+    # Number of timed chunks averaged per candidate batch size when tuning
+    _TUNE_NUM_SAMPLES = 2
+
+    # Relative throughput gain required to accept a larger batch size
+    _TUNE_MARGIN = 0.1
+
     def __init__(self, config=None):
         '''Creates a VGG16Classifier instance.
 
@@ -58,10 +113,43 @@ class VGG16Classifier(
                 default VGG16ClassifierConfig is used
         '''
         self.config = config or VGG16ClassifierConfig.default()
-        self._vgg16 = VGG16(config=config.config)
+        self._vgg16, self._vgg16_key = _acquire_vgg16(
+            self.config.config, self.config.quantization)
+
+        self._class_labels = self._vgg16.class_labels
+        self._num_classes = self._vgg16.num_classes
+
+        num_threads = self.config.num_preprocessing_threads
+        if num_threads is None:
+            num_threads = min(8, multiprocessing.cpu_count())
+        self._pool = ThreadPool(processes=int(num_threads))
+        self._prefetch_pool = ThreadPool(processes=1)
+
+        # Double-buffered staging for preprocessed images, reused across
+        # batches
+        self._staging = [None, None]
+        self._buffer_idx = 0
+
+        # Online batch size tuning state
+        batch_size = self.config.batch_size
+        if batch_size is None and self.config.autotune_batch_size:
+            batch_size = 32
+        self._batch_size = int(batch_size) if batch_size else None
+        self._tune_batch_size = self.config.autotune_batch_size
+        self._warmed_up = False
+        self._num_samples = 0
+        self._sample_imgs = 0
+        self._sample_time = 0.0
+        self._best_batch_size = self._batch_size
+        self._best_throughput = 0.0
+        self._max_ok_batch_size = 0  # largest size known to fit in memory
+        self._min_oom_batch_size = None  # smallest size known not to fit
+
+        # Released AttributeContainers that can be reused by predictions
+        self._predictions_pool = etal.PredictionsPool(self.config.attr_name)
 
         self._last_features = None
-        self._last_probs = None
+        self._last_logits = None
 
     def __enter__(self):
         return self
@@ -71,8 +159,18 @@ class VGG16Classifier(
 
     def close(self):
         '''Closes the session and releases any memory.'''
-        self._vgg16.close()
-        self._vgg16 = None
+        if self._vgg16 is not None:
+            _release_vgg16(self._vgg16_key)
+            self._vgg16 = None
+
+        self._prefetch_pool.close()
+        self._prefetch_pool.join()
+        self._pool.close()
+        self._pool.join()
+
+        self._staging = [None, None]
+        self._predictions_pool.clear()
+        self.invalidate_cache()
 
     @property
     def exposes_features(self):
@@ -92,17 +190,41 @@ class VGG16Classifier(
     @property
     def exposes_probabilities(self):
         '''Whether this classifier exposes probabilities for predictions.'''
-        return True
+        return self.config.keep_full_probs
 
     @property
     def num_classes(self):
         '''The number of classes for the model.'''
-        return self._vgg16.num_classes
+        return self._num_classes
 
     @property
     def class_labels(self):
         '''The list of class labels generated by the classifier.'''
-        return self._vgg16.class_labels
+        return self._class_labels
+
+    def release_predictions(self, predictions):
+        '''Returns the given predictions to the classifier so that their
+        `eta.core.data.AttributeContainer`s can be reused by future
+        predictions.
+
+        This is an optional optimization for long-running callers that
+        process many batches. The caller must not use the predictions after
+        releasing them; see `eta.core.learning.PredictionsPool` for details.
+
+        Args:
+            predictions: a list of predictions returned by `predict_all()`
+        '''
+        self._predictions_pool.release(predictions)
+
+    def invalidate_cache(self):
+        '''Releases the features and probabilities stored from the last
+        prediction.
+
+        Long-running callers can use this method to free the (potentially
+        large) arrays retained by the classifier once they have consumed them.
+        '''
+        self._last_features = None
+        self._last_logits = None
 
     def get_features(self):
         '''Gets the features generated by the classifier from its last
@@ -125,10 +247,14 @@ class VGG16Classifier(
             an array of class probabilities, or None if the classifier has not
                 (or does not) generate probabilities
         '''
-        if not self.exposes_probabilities:
+        if not self.exposes_probabilities or self._last_logits is None:
             return None
 
-        return self._last_probs
+        # Softmax is computed lazily since predictions only need the argmax
+        logits = self._last_logits
+        probs = np.exp(logits - np.max(logits, axis=1, keepdims=True))
+        probs /= np.sum(probs, axis=1, keepdims=True)
+        return probs[:, np.newaxis, :]  # n x 1 x num_classes
 
     def predict(self, img):
         '''Peforms prediction on the given image.
@@ -155,37 +281,267 @@ class VGG16Classifier(
         return self._predict(imgs)
 
     def _predict(self, imgs):
-        # Perform preprocessing
-        imgs = [VGG16.preprocess_image(img) for img in imgs]
+        # Process the images in chunks whose size is tuned online. Once the
+        # batch size is stable, the next chunk is preprocessed in the
+        # background while the current chunk is being evaluated, alternating
+        # between two staging buffers
+        num_imgs = len(imgs)
+        top_idx, top_conf, logits, features = [], [], [], []
+        start = 0
+        self._buffer_idx = 0
+        pending = self._submit_preprocess(imgs, start)
+        while True:
+            batch = pending.get()
+            next_start = start + len(batch)
+
+            # While tuning, the size of the next chunk depends on the timing
+            # of this one, so it cannot be prefetched yet
+            pending = None
+            if not self._tune_batch_size and next_start < num_imgs:
+                pending = self._submit_preprocess(imgs, next_start)
+
+            try:
+                with etau.Timer() as timer:
+                    outputs = self._evaluate(batch)
+            except tf.errors.ResourceExhaustedError:
+                if len(batch) <= 1 or not self.config.autotune_batch_size:
+                    raise
+
+                if pending is not None:
+                    pending.wait()
+
+                self._handle_out_of_memory(len(batch))
+                pending = self._submit_preprocess(imgs, start)
+                continue
+
+            self._update_batch_size(len(batch), timer.elapsed_time)
+
+            top_idx.append(outputs[0])
+            top_conf.append(outputs[1])
+            logits.append(outputs[2])
+            features.append(outputs[3])
+
+            if next_start >= num_imgs:
+                break
+
+            if pending is None:
+                pending = self._submit_preprocess(imgs, next_start)
+
+            start = next_start
+
+        class_labels = self.class_labels
+        predictions = [
+            self._predictions_pool.package(
+                class_labels[idx], float(confidence))
+            for idx, confidence in zip(
+                np.concatenate(top_idx), np.concatenate(top_conf))]
 
-        # Perform inference
+        # Save data, if necessary
         if self.exposes_features:
-            tensors = [self._vgg16.probs, self._vgg16.fc2l]
-            probs, features = self._vgg16.evaluate(imgs, tensors)
+            features = np.concatenate(features)
+            # Cached arrays are shared with callers, so make them read-only
+            features.setflags(write=False)
+            self._last_features = features  # n x features_dim
+        if self.exposes_probabilities:
+            self._last_logits = np.concatenate(logits)  # n x num_classes
+
+        return predictions
+
+    def _submit_preprocess(self, imgs, start):
+        # Consecutive chunks alternate staging buffers, so a pending chunk
+        # never overwrites the chunk that is being evaluated
+        self._buffer_idx = 1 - self._buffer_idx
+        stop = len(imgs)
+        if self._batch_size is not None:
+            stop = min(start + self._batch_size, stop)
+        return self._prefetch_pool.apply_async(
+            self._preprocess, (imgs[start:stop], self._buffer_idx))
+
+    def _preprocess(self, imgs, buffer_idx):
+        out = self._get_staging_buffer(len(imgs), buffer_idx)
+        return VGG16.preprocess_batch(imgs, pool=self._pool, out=out)
+
+    def _evaluate(self, imgs):
+        # Perform inference, fetching all outputs in a single run. When the
+        # full distribution is not needed, only the top-k predictions are
+        # transferred off the device
+        if self.exposes_probabilities:
+            tensors = [self._vgg16.logits]
         else:
-            tensors = [self._vgg16.probs]
-            probs = self._vgg16.evaluate(imgs, tensors)[0]
-            features = None
+            tensors = [self._vgg16.top_k_inds, self._vgg16.top_k_probs]
+        if self.exposes_features:
+            tensors.append(self._vgg16.fc2l)
+
+        outputs = self._vgg16.evaluate(imgs, tensors)
+        features = outputs.pop() if self.exposes_features else None
 
         # Parse predictions
-        predictions = [self._parse_prediction(p) for p in probs]
+        if self.exposes_probabilities:
+            logits = outputs[0]
+            top_idx, top_conf = self._get_top_predictions(logits)
+        else:
+            logits = None
+            top_k_inds, top_k_probs = outputs
+            top_idx = top_k_inds[:, 0].astype(np.int32)
+            top_conf = top_k_probs[:, 0].astype(np.float32)
+
+        return top_idx, top_conf, logits, features
+
+    def _update_batch_size(self, num_imgs, elapsed_time):
+        # Only full chunks are informative about the throughput curve
+        if not self._tune_batch_size or num_imgs < self._batch_size:
+            return
+
+        self._max_ok_batch_size = max(
+            self._max_ok_batch_size, self._batch_size)
+
+        # The first run includes one-time graph warmup costs
+        if not self._warmed_up:
+            self._warmed_up = True
+            return
+
+        # Average several chunks per candidate size to reduce timing noise
+        self._num_samples += 1
+        self._sample_imgs += num_imgs
+        self._sample_time += elapsed_time
+        if self._num_samples < self._TUNE_NUM_SAMPLES:
+            return
+
+        throughput = self._sample_imgs / max(self._sample_time, 1e-6)
+        self._reset_samples()
+
+        min_throughput = self._best_throughput * (1.0 + self._TUNE_MARGIN)
+        if throughput <= min_throughput:
+            # No significant improvement, so settle on the best size found
+            self._finish_tuning()
+            return
+
+        self._best_throughput = throughput
+        self._best_batch_size = self._batch_size
+
+        next_batch_size = self._get_next_batch_size()
+        if next_batch_size is None:
+            self._finish_tuning()
+        else:
+            self._batch_size = next_batch_size
 
-        # Save data, if necessary
-        if self.exposes_features:
-            self._last_features = features  # n x features_dim
-        self._last_probs = probs[:, np.newaxis, :]  # n x 1 x num_classes
+    def _get_next_batch_size(self):
+        # Grow geometrically until an out-of-memory error bounds the search,
+        # then bisect between the largest working and smallest failing sizes
+        if self._min_oom_batch_size is None:
+            next_batch_size = 2 * self._batch_size
+        else:
+            next_batch_size = (
+                self._batch_size + self._min_oom_batch_size) // 2
 
-        return predictions
+        next_batch_size = min(next_batch_size, self.config.max_batch_size)
+        if next_batch_size <= self._batch_size:
+            return None
 
-    def _parse_prediction(self, probs):
-        idx = np.argmax(probs)
-        label = self.class_labels[idx]
-        confidence = probs[idx]
-        return self._package_attr(label, confidence)
-
-    def _package_attr(self, label, confidence):
-        attrs = etad.AttributeContainer()
-        attr = etad.CategoricalAttribute(
-            self.config.attr_name, label, confidence=confidence)
-        attrs.add(attr)
-        return attrs
+        return next_batch_size
+
+    def _handle_out_of_memory(self, batch_size):
+        if self._min_oom_batch_size is None:
+            self._min_oom_batch_size = batch_size
+        else:
+            self._min_oom_batch_size = min(
+                self._min_oom_batch_size, batch_size)
+
+        # Bisect between the largest size known to fit and the failed size
+        lower = self._max_ok_batch_size
+        next_batch_size = (lower + batch_size) // 2
+        if next_batch_size <= lower:
+            next_batch_size = lower
+            self._finish_tuning()
+
+        self._batch_size = max(1, next_batch_size)
+        self._best_batch_size = min(
+            self._best_batch_size, self._batch_size)
+        self._reset_samples()
+        logger.warning(
+            "Ran out of memory with batch size %d; retrying with batch size "
+            "%d", batch_size, self._batch_size)
+
+    def _reset_samples(self):
+        self._num_samples = 0
+        self._sample_imgs = 0
+        self._sample_time = 0.0
+
+    def _finish_tuning(self):
+        self._batch_size = self._best_batch_size
+        self._tune_batch_size = False
+        logger.debug("Using batch size %d", self._batch_size)
+
+    def _get_staging_buffer(self, batch_size, buffer_idx):
+        staging = self._staging[buffer_idx]
+        if staging is None or len(staging) < batch_size:
+            staging = np.empty((batch_size, 224, 224, 3), dtype=np.float32)
+            self._staging[buffer_idx] = staging
+
+        return staging
+
+    @staticmethod
+    def _get_top_predictions(logits):
+        # Reduce over a C-contiguous n x num_classes array so that numpy can
+        # use its vectorized inner loops along the class axis
+        logits = np.ascontiguousarray(logits)
+        idxs = np.argmax(logits, axis=1).astype(np.int32)
+        max_logits = logits[np.arange(len(idxs)), idxs]
+
+        # The softmax probability of the argmax class only requires the sum
+        # of the shifted exponentials, not the full distribution
+        confidences = 1.0 / np.sum(
+            np.exp(logits - max_logits[:, np.newaxis]), axis=1)
+
+        return idxs, confidences.astype(np.float32)
+
+
+class _VGG16CacheEntry(object):
+
+    def __init__(self):
+        self.vgg16 = None
+        self.refcount = 0
+        self.lock = threading.Lock()
+
+
+def _acquire_vgg16(config, quantization):
+    if config is None:
+        config = VGG16Config.default()
+
+    key = (config.to_str(), quantization)
+    with _VGG16_CACHE_LOCK:
+        entry = _VGG16_CACHE.get(key, None)
+        if entry is None:
+            entry = _VGG16CacheEntry()
+            _VGG16_CACHE[key] = entry
+
+        entry.refcount += 1
+
+    # Networks are built under a per-entry lock so that loading one
+    # configuration does not block acquiring the others
+    with entry.lock:
+        if entry.vgg16 is None:
+            try:
+                if quantization:
+                    entry.vgg16 = VGG16TFLite(
+                        config=config, quantization=quantization)
+                else:
+                    entry.vgg16 = VGG16(config=config)
+            except:
+                _release_vgg16(key)
+                raise
+
+    return entry.vgg16, key
+
+
+def _release_vgg16(key):
+    with _VGG16_CACHE_LOCK:
+        entry = _VGG16_CACHE[key]
+        entry.refcount -= 1
+        if entry.refcount > 0:
+            return
+
+        del _VGG16_CACHE[key]
+
+    if entry.vgg16 is not None:
+        entry.vgg16.close()
@@ -13,13 +13,17 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from builtins import *
 from future.utils import iteritems, itervalues
+import six
 # pragma pylint: enable=redefined-builtin
 # pragma pylint: enable=unused-wildcard-import
 # pragma pylint: enable=wildcard-import
 
 from collections import defaultdict
-from copy import deepcopy
+from copy import copy, deepcopy
 import logging
+from operator import attrgetter
+
+import numpy as np
 
 import eta.core.data as etad
 import eta.core.frameutils as etaf
@@ -52,6 +56,11 @@ class DetectedEvent(etal.Labels, etag.HasBoundingBox):
             objects in the frame
     '''
 
+    # The optional fields that are serialized only when they are not None
+    _NONEABLE_ATTRS = (
+        "label", "bounding_box", "mask", "confidence", "top_k_probs", "index",
+        "frame_number")
+
     def __init__(
             self, label=None, bounding_box=None, mask=None, confidence=None,
             top_k_probs=None, index=None, frame_number=None, attrs=None,
@@ -72,16 +81,48 @@ class DetectedEvent(etal.Labels, etag.HasBoundingBox):
             objects: (optional) a DetectedObjectContainer of detected objects
                 for the frame
         '''
-        self.type = etau.get_class_name(self)
-        self.label = label
+        self.type = _get_type(self)
+        self.label = _intern(label)
         self.bounding_box = bounding_box
         self.mask = mask
         self.confidence = confidence
         self.top_k_probs = top_k_probs
         self.index = index
         self.frame_number = frame_number
-        self.attrs = attrs or etad.AttributeContainer()
-        self.objects = objects or etao.DetectedObjectContainer()
+        self._attrs = attrs or None
+        self._objects = objects or None
+
+    @property
+    def attrs(self):
+        '''The AttributeContainer of attributes of the event.
+
+        The container is created on first access, so events without attributes
+        do not allocate one.
+        '''
+        if self._attrs is None:
+            self._attrs = etad.AttributeContainer()
+
+        return self._attrs
+
+    @attrs.setter
+    def attrs(self, attrs):
+        self._attrs = attrs
+
+    @property
+    def objects(self):
+        '''The DetectedObjectContainer of objects in the event.
+
+        The container is created on first access, so events without objects do
+        not allocate one.
+        '''
+        if self._objects is None:
+            self._objects = etao.DetectedObjectContainer()
+
+        return self._objects
+
+    @objects.setter
+    def objects(self, objects):
+        self._objects = objects
 
     @property
     def is_empty(self):
@@ -128,12 +169,12 @@ class DetectedEvent(etal.Labels, etag.HasBoundingBox):
     @property
     def has_attributes(self):
         '''Whether the event has attributes.'''
-        return bool(self.attrs)
+        return bool(self._attrs)
 
     @property
     def has_objects(self):
         '''Whether the event has at least one object.'''
-        return bool(self.objects)
+        return bool(self._objects)
 
     @classmethod
     def get_schema_cls(cls):
@@ -267,11 +308,11 @@ class DetectedEvent(etal.Labels, etag.HasBoundingBox):
 
     def clear_attributes(self):
         '''Removes all frame-level attributes from the event.'''
-        self.attrs = etad.AttributeContainer()
+        self._attrs = None
 
     def clear_objects(self):
         '''Removes all objects from the event.'''
-        self.objects = etao.DetectedObjectContainer()
+        self._objects = None
 
     def clear_object_attributes(self):
         '''Removes all object-level attributes from the event.'''
@@ -322,14 +363,14 @@ class DetectedEvent(etal.Labels, etag.HasBoundingBox):
             a list of attribute names
         '''
         _attrs = ["type"]
-        _noneable_attrs = [
-            "label", "bounding_box", "mask", "confidence", "top_k_probs",
-            "index", "frame_number"]
-        _attrs.extend(
-            [a for a in _noneable_attrs if getattr(self, a) is not None])
-        if self.attrs:
+        values = self.__dict__
+        for a in self._NONEABLE_ATTRS:
+            if values[a] is not None:
+                _attrs.append(a)
+
+        if self._attrs:
             _attrs.append("attrs")
-        if self.objects:
+        if self._objects:
             _attrs.append("objects")
 
         return _attrs
@@ -386,7 +427,7 @@ class DetectedEventContainer(etal.LabelsContainer):
         Returns:
             a set of labels
         '''
-        return set(devent.label for devent in self)
+        return set(map(attrgetter("label"), self.events))
 
     def get_indexes(self):
         '''Returns the set of `index`es of all events in the container.
@@ -451,7 +492,7 @@ class DetectedEventContainer(etal.LabelsContainer):
         Args:
             reverse: whether to sort in descending order. The default is False
         '''
-        self.sort_by("confidence", reverse=reverse)
+        _sort_by_numeric_attr(self, "confidence", reverse)
 
     def sort_by_index(self, reverse=False):
         '''Sorts the `DetectedEvent`s by index.
@@ -461,7 +502,7 @@ class DetectedEventContainer(etal.LabelsContainer):
         Args:
             reverse: whether to sort in descending order. The default is False
         '''
-        self.sort_by("index", reverse=reverse)
+        _sort_by_numeric_attr(self, "index", reverse)
 
     def sort_by_frame_number(self, reverse=False):
         '''Sorts the `DetectedEvent`s by frame number
@@ -471,7 +512,7 @@ class DetectedEventContainer(etal.LabelsContainer):
         Args:
             reverse: whether to sort in descending order. The default is False
         '''
-        self.sort_by("frame_number", reverse=reverse)
+        _sort_by_numeric_attr(self, "frame_number", reverse)
 
     def filter_by_schema(self, schema):
         '''Filters the events in the container by the given schema.
@@ -479,14 +520,15 @@ class DetectedEventContainer(etal.LabelsContainer):
         Args:
             schema: an EventContainerSchema
         '''
+        # Look up the schema of each event label only once
+        event_schemas = dict(schema.iter_events())
+
         # Remove events with invalid labels
-        filter_func = lambda event: schema.has_event_label(event.label)
-        self.filter_elements([filter_func])
+        self.events = [e for e in self.events if e.label in event_schemas]
 
         # Filter events by their schemas
-        for event in self:
-            event_schema = schema.get_event_schema(event.label)
-            event.filter_by_schema(event_schema)
+        for event in self.events:
+            event.filter_by_schema(event_schemas[event.label])
 
     def remove_objects_without_attrs(self, labels=None):
         '''Removes objects from this container that do not have attributes.
@@ -499,6 +541,35 @@ class DetectedEventContainer(etal.LabelsContainer):
         for event in self:
             event.remove_objects_without_attrs(labels=labels)
 
+    @classmethod
+    def from_dict(cls, d):
+        '''Constructs a DetectedEventContainer from a JSON dictionary.
+
+        The events are parsed column-wise, i.e., each field is extracted from
+        all event dictionaries at once, which avoids most of the per-event
+        overhead of `DetectedEvent.from_dict()` for large containers.
+
+        Args:
+            d: a JSON dictionary
+
+        Returns:
+            a DetectedEventContainer
+        '''
+        container_cls = cls._validate_dict(d)
+        event_cls = container_cls.get_element_class()
+        default_from_dict = DetectedEvent.from_dict.__func__
+        if event_cls.from_dict.__func__ is not default_from_dict:
+            # Custom event classes must be parsed by their own `from_dict()`
+            return super(DetectedEventContainer, cls).from_dict(d)
+
+        schema = d.get("schema", None)
+        if schema is not None:
+            schema = container_cls.get_schema_cls().from_dict(schema)
+
+        events = _parse_detected_events(event_cls, d[container_cls._ELE_ATTR])
+        return container_cls(
+            schema=schema, **{container_cls._ELE_ATTR: events})
+
 
 class VideoEvent(
         etal.Labels, etal.HasLabelsSupport, etal.HasFramewiseView,
@@ -555,6 +626,9 @@ class VideoEvent(
         frames: dictionary mapping frame numbers to `DetectedEvent`s
     '''
 
+    # The optional fields that are serialized only when they are not None
+    _NONEABLE_ATTRS = ("label", "confidence", "index")
+
     def __init__(
             self, label=None, confidence=None, index=None, support=None,
             attrs=None, objects=None, frames=None):
@@ -571,15 +645,47 @@ class VideoEvent(
             frames: (optional) dictionary mapping frame numbers to
                 `DetectedEvent`s
         '''
-        self.type = etau.get_class_name(self)
-        self.label = label
+        self.type = _get_type(self)
+        self.label = _intern(label)
         self.confidence = confidence
         self.index = index
-        self.attrs = attrs or etad.AttributeContainer()
-        self.objects = objects or etao.VideoObjectContainer()
-        self.frames = frames or {}
+        self._attrs = attrs or None
+        self._objects = objects or None
+        self.frames = _FrameDict(frames or {})
         etal.HasLabelsSupport.__init__(self, support=support)
 
+    @property
+    def attrs(self):
+        '''The AttributeContainer of event-level attributes.
+
+        The container is created on first access, so events without
+        event-level attributes do not allocate one.
+        '''
+        if self._attrs is None:
+            self._attrs = etad.AttributeContainer()
+
+        return self._attrs
+
+    @attrs.setter
+    def attrs(self, attrs):
+        self._attrs = attrs
+
+    @property
+    def objects(self):
+        '''The VideoObjectContainer of objects in the event.
+
+        The container is created on first access, so events without objects do
+        not allocate one.
+        '''
+        if self._objects is None:
+            self._objects = etao.VideoObjectContainer()
+
+        return self._objects
+
+    @objects.setter
+    def objects(self, objects):
+        self._objects = objects
+
     @property
     def is_empty(self):
         '''Whether the event has no labels of any kind.'''
@@ -605,16 +711,13 @@ class VideoEvent(
     @property
     def has_event_attributes(self):
         '''Whether the event has event-level attributes.'''
-        return bool(self.attrs)
+        return bool(self._attrs)
 
     @property
     def has_frame_attributes(self):
         '''Whether the event has frame-level attributes.'''
-        for event in self.iter_detections():
-            if event.has_attributes:
-                return True
-
-        return False
+        # Reads the containers directly to avoid a property call per frame
+        return any(devent._attrs for devent in itervalues(self.frames))
 
     @property
     def has_attributes(self):
@@ -624,16 +727,13 @@ class VideoEvent(
     @property
     def has_video_objects(self):
         '''Whether the event has at least one VideoObject.'''
-        return bool(self.objects)
+        return bool(self._objects)
 
     @property
     def has_detected_objects(self):
         '''Whether the event has at least one DetectedObject.'''
-        for event in self.iter_detections():
-            if event.has_objects:
-                return True
-
-        return False
+        # Reads the containers directly to avoid a property call per frame
+        return any(devent._objects for devent in itervalues(self.frames))
 
     @property
     def has_detections(self):
@@ -675,8 +775,14 @@ class VideoEvent(
         Returns:
             an iterator over `DetectedEvent`s
         '''
-        for frame_number in sorted(self.frames):
-            yield self.frames[frame_number]
+        frames = self.frames
+        if isinstance(frames, _FrameDict):
+            frame_numbers = frames.sorted_keys()
+        else:
+            frame_numbers = sorted(frames)
+
+        for frame_number in frame_numbers:
+            yield frames[frame_number]
 
     def get_index(self):
         '''Returns the `index` of the event.
@@ -780,8 +886,7 @@ class VideoEvent(
             attr: an Attribute
             frame_number: the frame number
         '''
-        self._ensure_frame(frame_number)
-        self.frames[frame_number].add_attribute(attr)
+        self._ensure_frame(frame_number).add_attribute(attr)
 
     def add_frame_attributes(self, attrs, frame_number):
         '''Adds the given frame-level attributes to the event.
@@ -790,8 +895,7 @@ class VideoEvent(
             attrs: an AttributeContainer
             frame_number: the frame number
         '''
-        self._ensure_frame(frame_number)
-        self.frames[frame_number].add_attributes(attrs)
+        self._ensure_frame(frame_number).add_attributes(attrs)
 
     def add_object(self, obj, frame_number=None):
         '''Adds the object to the event.
@@ -845,10 +949,9 @@ class VideoEvent(
 
     def remove_empty_frames(self):
         '''Removes all empty DetectedEvents from this event.'''
-        self.frames = {
-            fn: devent for fn, devent in iteritems(self.frames)
-            if not devent.is_empty
-        }
+        self.frames = _FrameDict(
+            (fn, devent) for fn, devent in iteritems(self.frames)
+            if not devent.is_empty)
 
     def clear_attributes(self):
         '''Removes all attributes of any kind from the event.'''
@@ -857,11 +960,11 @@ class VideoEvent(
 
     def clear_event_attributes(self):
         '''Removes all event-level attributes from the event.'''
-        self.attrs = etad.AttributeContainer()
+        self._attrs = None
 
     def clear_video_objects(self):
         '''Removes all `VideoObject`s from the event.'''
-        self.objects = etao.VideoObjectContainer()
+        self._objects = None
 
     def clear_frame_attributes(self):
         '''Removes all frame attributes from the event.'''
@@ -875,7 +978,7 @@ class VideoEvent(
 
     def clear_detections(self):
         '''Removes all `DetectedEvent`s from the event.'''
-        self.frames = {}
+        self.frames = _FrameDict()
 
     def filter_by_schema(self, schema):
         '''Filters the event by the given schema.
@@ -911,17 +1014,16 @@ class VideoEvent(
             a list of attrinutes
         '''
         _attrs = ["type"]
-        if self.label is not None:
-            _attrs.append("label")
-        if self.confidence is not None:
-            _attrs.append("confidence")
-        if self.index is not None:
-            _attrs.append("index")
+        values = self.__dict__
+        for a in self._NONEABLE_ATTRS:
+            if values[a] is not None:
+                _attrs.append(a)
+
         if self.is_support_frozen:
             _attrs.append("support")
-        if self.attrs:
+        if self._attrs:
             _attrs.append("attrs")
-        if self.objects:
+        if self._objects:
             _attrs.append("objects")
         if self.frames:
             _attrs.append("frames")
@@ -1017,10 +1119,10 @@ class VideoEvent(
 
         frames = d.get("frames", None)
         if frames is not None:
-            frames = {
-                int(fn): DetectedEvent.from_dict(do)
-                for fn, do in iteritems(frames)
-            }
+            frame_numbers = list(frames)
+            devents = _parse_detected_events(
+                DetectedEvent, [frames[fn] for fn in frame_numbers])
+            frames = dict(zip(map(int, frame_numbers), devents))
 
         return cls(
             label=d.get("label", None),
@@ -1050,9 +1152,12 @@ class VideoEvent(
         return event_cls._from_dict(d)
 
     def _ensure_frame(self, frame_number):
-        if not frame_number in self.frames:
-            self.frames[frame_number] = DetectedEvent(
-                frame_number=frame_number)
+        devent = self.frames.get(frame_number, None)
+        if devent is None:
+            devent = DetectedEvent(frame_number=frame_number)
+            self.frames[frame_number] = devent
+
+        return devent
 
     def _add_detected_object(self, obj, frame_number):
         if frame_number is None:
@@ -1064,12 +1169,27 @@ class VideoEvent(
             frame_number = obj.frame_number
 
         obj.frame_number = frame_number
-        self._ensure_frame(frame_number)
-        self.frames[frame_number].add_object(obj)
+        self._ensure_frame(frame_number).add_object(obj)
 
     def _add_detected_objects(self, objects, frame_number):
+        # Specialized version of `_add_detected_object()` for bulk additions
+        frames = self.frames
         for dobj in objects:
-            self._add_detected_object(dobj, frame_number)
+            fn = frame_number
+            if fn is None:
+                fn = dobj.frame_number
+                if fn is None:
+                    raise ValueError(
+                        "Either `frame_number` must be provided or the "
+                        "DetectedObject must have its `frame_number` set")
+
+            dobj.frame_number = fn
+            devent = frames.get(fn, None)
+            if devent is None:
+                devent = DetectedEvent(frame_number=fn)
+                frames[fn] = devent
+
+            devent.add_object(dobj)
 
     def _add_detected_event(self, devent, frame_number):
         if frame_number is None:
@@ -1096,13 +1216,46 @@ class VideoEvent(
         self.frames[frame_number] = devent
 
     def _add_detected_events(self, events):
+        # Specialized version of `_add_detected_event()` for bulk additions
+        frames = self.frames
+        label = self.label
+        index = self.index
         for devent in events:
-            self._add_detected_event(devent, None)
+            if devent.frame_number is None:
+                raise ValueError(
+                    "Either `frame_number` must be provided or the "
+                    "DetectedEvent must have its `frame_number` set")
+
+            if devent.label is not None and devent.label != label:
+                logger.warning(
+                    "Erasing DetectedEvent label '%s' that does not match "
+                    "VideoEvent label '%s'", devent.label, label)
+
+            if devent.index is not None and devent.index != index:
+                logger.warning(
+                    "Erasing DetectedEvent index '%s' that does not match "
+                    "VideoEvent index '%s'", devent.index, index)
+
+            devent.label = None
+            devent.index = None
+            frames[devent.frame_number] = devent
 
     def _compute_support(self):
-        frame_ranges = etaf.FrameRanges.from_iterable(self.frames.keys())
-        frame_ranges.merge(*[obj.support for obj in self.objects])
-        return frame_ranges
+        frames = self.frames
+        if not isinstance(frames, _FrameDict):
+            frames = _FrameDict(frames)
+
+        if not self._objects:
+            return etaf.FrameRanges(ranges=frames.ranges())
+
+        # Merge the range endpoints of the objects rather than expanding
+        # them into frame numbers, so the cost scales with the number of
+        # ranges rather than the number of frames they span
+        ranges = list(frames.ranges())
+        for obj in self._objects:
+            ranges.extend(obj.support.to_range_tuples())
+
+        return etaf.FrameRanges(ranges=_merge_frame_ranges(ranges))
 
 
 class VideoEventContainer(
@@ -1130,7 +1283,7 @@ class VideoEventContainer(
         Returns:
             a set of labels
         '''
-        return set(event.label for event in self)
+        return set(map(attrgetter("label"), self.events))
 
     def get_indexes(self):
         '''Returns the set of `index`es of all events in the container.
@@ -1216,14 +1369,15 @@ class VideoEventContainer(
         Raises:
             LabelsSchemaError: if the label does not match the schema
         '''
+        # Look up the schema of each event label only once
+        event_schemas = schema.schema
+
         # Filter by event label
-        filter_func = lambda event: schema.has_event_label(event.label)
-        self.filter_elements([filter_func])
+        self.events = [e for e in self.events if e.label in event_schemas]
 
         # Filter events
-        for event in self:
-            event_schema = schema.get_event_schema(event.label)
-            event.filter_by_schema(event_schema)
+        for event in self.events:
+            event.filter_by_schema(event_schemas[event.label])
 
     def remove_objects_without_attrs(self, labels=None):
         '''Removes objects that do not have attributes from all events in this
@@ -1235,7 +1389,12 @@ class VideoEventContainer(
                 processed
         '''
         for event in self:
-            event.remove_objects_without_attrs(labels=labels)
+            if event._objects:
+                _remove_objects_without_attrs(event._objects, labels)
+
+            for devent in itervalues(event.frames):
+                if devent._objects:
+                    _remove_objects_without_attrs(devent._objects, labels)
 
     @classmethod
     def from_detections(cls, events):
@@ -1291,6 +1450,10 @@ class EventSchema(etal.LabelsSchema):
         objects: an ObjectContainerSchema describing the objects of the event
     '''
 
+    # Schemas are created per event label, and often per event when building
+    # active schemas, so their fields are stored in slots
+    __slots__ = ("label", "_attrs", "_frames", "_objects")
+
     def __init__(self, label, attrs=None, frames=None, objects=None):
         '''Creates an EventSchema instance.
 
@@ -1303,10 +1466,58 @@ class EventSchema(etal.LabelsSchema):
             objects: (optional) an ObjectContainerSchema describing the objects
                 of the event
         '''
-        self.label = label
-        self.attrs = attrs or etad.AttributeContainerSchema()
-        self.frames = frames or etad.AttributeContainerSchema()
-        self.objects = objects or etao.ObjectContainerSchema()
+        self.label = _intern(label)
+        self._attrs = attrs or None
+        self._frames = frames or None
+        self._objects = objects or None
+
+    @property
+    def attrs(self):
+        '''The AttributeContainerSchema of event-level attributes.
+
+        The schema is created on first access, so that schemas without
+        event-level attributes do not allocate one.
+        '''
+        if self._attrs is None:
+            self._attrs = etad.AttributeContainerSchema()
+
+        return self._attrs
+
+    @attrs.setter
+    def attrs(self, attrs):
+        self._attrs = attrs
+
+    @property
+    def frames(self):
+        '''The AttributeContainerSchema of frame-level attributes.
+
+        The schema is created on first access, so that schemas without
+        frame-level attributes do not allocate one.
+        '''
+        if self._frames is None:
+            self._frames = etad.AttributeContainerSchema()
+
+        return self._frames
+
+    @frames.setter
+    def frames(self, frames):
+        self._frames = frames
+
+    @property
+    def objects(self):
+        '''The ObjectContainerSchema of objects.
+
+        The schema is created on first access, so that schemas without objects
+        do not allocate one.
+        '''
+        if self._objects is None:
+            self._objects = etao.ObjectContainerSchema()
+
+        return self._objects
+
+    @objects.setter
+    def objects(self, objects):
+        self._objects = objects
 
     @property
     def is_empty(self):
@@ -1341,7 +1552,7 @@ class EventSchema(etal.LabelsSchema):
         Returns:
             True/False
         '''
-        return self.attrs.has_attribute(attr_name)
+        return attr_name in self.attrs.schema
 
     def get_event_attribute_schema(self, attr_name):
         '''Gets the AttributeSchema for the event-level attribute with the
@@ -1376,7 +1587,7 @@ class EventSchema(etal.LabelsSchema):
         Returns:
             True/False
         '''
-        return self.frames.has_attribute(attr_name)
+        return attr_name in self.frames.schema
 
     def get_frame_attribute_schema(self, attr_name):
         '''Gets the AttributeSchema for the frame-level attribute with the
@@ -1411,7 +1622,7 @@ class EventSchema(etal.LabelsSchema):
         Returns:
             True/False
         '''
-        return self.objects.has_object_label(label)
+        return label in self.objects.schema
 
     def has_object_attribute(self, label, attr_name):
         '''Whether the schema has an object with the given label with an
@@ -1424,7 +1635,11 @@ class EventSchema(etal.LabelsSchema):
         Returns:
             True/False
         '''
-        return self.objects.has_object_attribute(label, attr_name)
+        obj_schema = self.objects.schema.get(label, None)
+        if obj_schema is None:
+            return False
+
+        return attr_name in obj_schema.attrs.schema
 
     def has_object_frame_attribute(self, label, attr_name):
         '''Whether the schema has an object with the given label with a
@@ -1437,7 +1652,11 @@ class EventSchema(etal.LabelsSchema):
         Returns:
             True/False
         '''
-        return self.objects.has_frame_attribute(label, attr_name)
+        obj_schema = self.objects.schema.get(label, None)
+        if obj_schema is None:
+            return False
+
+        return attr_name in obj_schema.frames.schema
 
     def get_object_schema(self, label):
         '''Gets the ObjectSchema for the object with the given label.
@@ -1604,7 +1823,7 @@ class EventSchema(etal.LabelsSchema):
         Args:
             event: a VideoEvent or DetectedEvent
         '''
-        if isinstance(event, DetectedEvent):
+        if _is_detected_event(event):
             self._add_detected_event(event)
         else:
             self._add_video_event(event)
@@ -1615,8 +1834,17 @@ class EventSchema(etal.LabelsSchema):
         Args:
             events: a VideoEventContainer or DetectedEventContainer
         '''
+        # Every event must have the schema's label, so labels are compared
+        # inline and `validate_label()` is only invoked to raise the error
+        label = self.label
         for event in events:
-            self.add_event(event)
+            if event.label != label:
+                self.validate_label(event.label)
+
+            if _is_detected_event(event):
+                self._add_detected_event(event, validate_label=False)
+            else:
+                self._add_video_event(event, validate_label=False)
 
     def is_valid_event_attribute(self, attr):
         '''Whether the event-level attribute is compliant with the schema.
@@ -1725,7 +1953,7 @@ class EventSchema(etal.LabelsSchema):
         Returns:
             True/False
         '''
-        return self.objects.is_valid_frame_attributess(label, attrs)
+        return self.objects.is_valid_frame_attributes(label, attrs)
 
     def is_valid_object(self, obj):
         '''Whether the object is compliant with the schema.
@@ -1738,6 +1966,17 @@ class EventSchema(etal.LabelsSchema):
         '''
         return self.objects.is_valid_object(obj)
 
+    def is_valid_objects(self, objects):
+        '''Whether the objects are compliant with the schema.
+
+        Args:
+            objects: a VideoObjectContainer or DetectedObjectContainer
+
+        Returns:
+            True/False
+        '''
+        return self.objects.is_valid(objects)
+
     def validate_label(self, label):
         '''Validates that the event label is compliant with the schema.
 
@@ -1893,7 +2132,7 @@ class EventSchema(etal.LabelsSchema):
         Raises:
             LabelsSchemaError: if the event violates the schema
         '''
-        if isinstance(event, DetectedEvent):
+        if _is_detected_event(event):
             self._validate_detected_event(event)
         else:
             self._validate_video_event(event)
@@ -1926,9 +2165,12 @@ class EventSchema(etal.LabelsSchema):
             schema: an EventSchema
         '''
         self.validate_label(schema.label)
-        self.attrs.merge_schema(schema.attrs)
-        self.frames.merge_schema(schema.frames)
-        self.objects.merge_schema(schema.objects)
+        if schema._attrs:
+            self.attrs.merge_schema(schema._attrs)
+        if schema._frames:
+            self.frames.merge_schema(schema._frames)
+        if schema._objects:
+            self.objects.merge_schema(schema._objects)
 
     @classmethod
     def build_active_schema(cls, event):
@@ -1941,8 +2183,13 @@ class EventSchema(etal.LabelsSchema):
         Returns:
             an EventSchema
         '''
+        # The label matches by construction, so it need not be validated
         schema = cls(event.label)
-        schema.add_event(event)
+        if _is_detected_event(event):
+            schema._add_detected_event(event, validate_label=False)
+        else:
+            schema._add_video_event(event, validate_label=False)
+
         return schema
 
     def attributes(self):
@@ -1952,11 +2199,11 @@ class EventSchema(etal.LabelsSchema):
             a list of attribute names
         '''
         _attrs = ["label"]
-        if self.attrs:
+        if self._attrs:
             _attrs.append("attrs")
-        if self.frames:
+        if self._frames:
             _attrs.append("frames")
-        if self.objects:
+        if self._objects:
             _attrs.append("objects")
         return _attrs
 
@@ -1988,39 +2235,107 @@ class EventSchema(etal.LabelsSchema):
         if validate_label:
             self.validate_label(devent.label)
 
-        for attr in devent.attrs:
-            if attr.constant:
-                self.add_event_attribute(attr)
-            else:
-                self.add_frame_attribute(attr)
+        if devent.has_attributes:
+            for attr in devent.attrs:
+                if attr.constant:
+                    self.add_event_attribute(attr)
+                else:
+                    self.add_frame_attribute(attr)
 
-        self.add_objects(devent.objects)
+        if devent.has_objects:
+            self.add_objects(devent.objects)
 
-    def _add_video_event(self, event):
-        self.validate_label(event.label)
-        self.add_event_attributes(event.attrs)
-        self.add_objects(event.objects)
+    def _add_video_event(self, event, validate_label=True):
+        if validate_label:
+            self.validate_label(event.label)
+
+        if event.has_event_attributes:
+            self.add_event_attributes(event.attrs)
+        if event.has_video_objects:
+            self.add_objects(event.objects)
+
+        # Gather the contents of all frames so they can be added in bulk. The
+        # frames are traversed in sorted order so that the schema is built
+        # deterministically
+        event_attrs = []
+        frame_attrs = []
+        dobjs = []
         for devent in event.iter_detections():
-            self._add_detected_event(devent, validate_label=False)
+            if devent.has_attributes:
+                for attr in devent.attrs:
+                    if attr.constant:
+                        event_attrs.append(attr)
+                    else:
+                        frame_attrs.append(attr)
+
+            if devent.has_objects:
+                dobjs.extend(devent.objects)
+
+        if event_attrs:
+            self.add_event_attributes(event_attrs)
+        if frame_attrs:
+            self.add_frame_attributes(frame_attrs)
+        if dobjs:
+            self.add_objects(dobjs)
 
     def _validate_detected_event(self, devent, validate_label=True):
         if validate_label:
             self.validate_label(devent.label)
 
-        for attr in devent.attrs:
-            if attr.constant:
-                self.validate_event_attribute(attr)
-            else:
-                self.validate_frame_attribute(attr)
+        if devent.has_attributes:
+            validate_event_attribute = self.validate_event_attribute
+            validate_frame_attribute = self.validate_frame_attribute
+            for attr in devent.attrs:
+                if attr.constant:
+                    validate_event_attribute(attr)
+                else:
+                    validate_frame_attribute(attr)
 
-        self.validate_objects(devent.objects)
+        if devent.has_objects:
+            self.validate_objects(devent.objects)
 
     def _validate_video_event(self, event):
         self.validate_label(event.label)
-        self.validate_event_attributes(event.attrs)
-        self.validate_objects(event.objects)
-        for devent in event.iter_detections():
-            self._validate_detected_event(devent, validate_label=False)
+
+        # Stages with nothing to validate are skipped, which also avoids
+        # creating empty containers on the event and this schema
+        if event.has_event_attributes:
+            self.validate_event_attributes(event.attrs)
+
+        if event.has_video_objects:
+            self.validate_objects(event.objects)
+
+        # Attributes are validated per frame, since attribute exclusivity is
+        # enforced per frame, but objects can be validated in bulk. The order
+        # of the frames is irrelevant here, so they are not sorted.
+        #
+        # Frame attributes typically repeat across many frames, and whether an
+        # attribute is valid depends only on its type, name, and value, so
+        # each distinct attribute is only validated once
+        validate_event_attribute = self.validate_event_attribute
+        validate_frame_attribute = self.validate_frame_attribute
+        validated = set()
+        dobjs = []
+        for devent in itervalues(event.frames):
+            if devent.has_attributes:
+                for attr in devent.attrs:
+                    key = _get_attribute_key(attr)
+                    if key is not None and key in validated:
+                        continue
+
+                    if attr.constant:
+                        validate_event_attribute(attr)
+                    else:
+                        validate_frame_attribute(attr)
+
+                    if key is not None:
+                        validated.add(key)
+
+            if devent.has_objects:
+                dobjs.extend(devent.objects)
+
+        if dobjs:
+            self.validate_objects(dobjs)
 
 
 class EventSchemaError(etal.LabelsSchemaError):
@@ -2042,7 +2357,9 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             schema: (optional) a dictionary mapping event labels to EventSchema
                 instances
         '''
-        self.schema = schema or {}
+        self.schema = _EventSchemaDict(
+            (_intern(label), event_schema)
+            for label, event_schema in iteritems(schema or {}))
 
     @property
     def is_empty(self):
@@ -2086,7 +2403,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             an EventSchema
         '''
-        self.validate_event_label(label)
         return self.schema[label]
 
     def has_event_attribute(self, label, attr_name):
@@ -2100,7 +2416,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        if not self.has_event_label(label):
+        if label not in self.schema:
             return False
 
         return self.schema[label].has_event_attribute(attr_name)
@@ -2116,8 +2432,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             the AttributeSchema
         '''
-        event_schema = self.get_event_schema(label)
-        return event_schema.get_event_attribute_schema(attr_name)
+        return self.schema[label].get_event_attribute_schema(attr_name)
 
     def get_event_attribute_class(self, label, attr_name):
         '''Gets the Attribute class for the event-level attribute of the
@@ -2130,7 +2445,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             the Attribute subclass
         '''
-        self.validate_event_label(label)
         return self.schema[label].get_event_attribute_class(attr_name)
 
     def has_frame_attribute(self, label, attr_name):
@@ -2144,7 +2458,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        if not self.has_event_label(label):
+        if label not in self.schema:
             return False
 
         return self.schema[label].has_frame_attribute(attr_name)
@@ -2160,8 +2474,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             the AttributeSchema
         '''
-        event_schema = self.get_event_schema(label)
-        return event_schema.get_frame_attribute_schema(attr_name)
+        return self.schema[label].get_frame_attribute_schema(attr_name)
 
     def get_frame_attribute_class(self, label, attr_name):
         '''Gets the Attribute class for the frame-level attribute of the
@@ -2174,7 +2487,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             the Attribute subclass
         '''
-        self.validate_event_label(label)
         return self.schema[label].get_frame_attribute_class(attr_name)
 
     def has_object_label(self, event_label, obj_label):
@@ -2188,7 +2500,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        self.validate_event_label(event_label)
         return self.schema[event_label].has_object_label(obj_label)
 
     def get_object_schema(self, event_label, obj_label):
@@ -2202,7 +2513,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             the ObjectSchema
         '''
-        self.validate_event_label(event_label)
         return self.schema[event_label].get_object_schema(obj_label)
 
     def has_object_attribute(self, event_label, obj_label, attr_name):
@@ -2217,7 +2527,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        self.validate_event_label(event_label)
         return self.schema[event_label].has_object_attribute(
             obj_label, attr_name)
 
@@ -2234,7 +2543,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             the AttributeSchema
         '''
-        self.validate_event_label(event_label)
         return self.schema[event_label].get_object_attribute_schema(
             obj_label, attr_name)
 
@@ -2251,7 +2559,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             the Attribute
         '''
-        self.validate_event_label(event_label)
         return self.schema[event_label].get_object_attribute_class(
             obj_label, attr_name)
 
@@ -2267,7 +2574,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        self.validate_event_label(event_label)
         return self.schema[event_label].has_frame_attribute(
             obj_label, attr_name)
 
@@ -2285,7 +2591,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             the AttributeSchema
         '''
-        self.validate_event_label(event_label)
         return self.schema[event_label].get_object_attribute_schema(
             obj_label, attr_name)
 
@@ -2303,7 +2608,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             the Attribute
         '''
-        self.validate_event_label(event_label)
         return self.schema[event_label].get_object_frame_attribute_class(
             obj_label, attr_name)
 
@@ -2323,8 +2627,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             label: an event label
             attr: an event-level Attribute
         '''
-        self._ensure_has_event_label(label)
-        self.schema[label].add_event_attribute(attr)
+        self._ensure_has_event_label(label).add_event_attribute(attr)
 
     def add_event_attributes(self, label, attrs):
         '''Adds the AttributeContainer of event-level attributes for the
@@ -2334,8 +2637,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             label: an event label
             attrs: an AttributeContainer of event-level attributes
         '''
-        self._ensure_has_event_label(label)
-        self.schema[label].add_event_attributes(attrs)
+        self._ensure_has_event_label(label).add_event_attributes(attrs)
 
     def add_frame_attribute(self, label, attr):
         '''Adds the frame-level attribute for the event with the given label to
@@ -2345,8 +2647,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             label: an event label
             attr: a frame-level Attribute
         '''
-        self._ensure_has_event_label(label)
-        self.schema[label].add_frame_attribute(attr)
+        self._ensure_has_event_label(label).add_frame_attribute(attr)
 
     def add_frame_attributes(self, label, attrs):
         '''Adds the AttributeContainer of frame-level attributes for the
@@ -2356,8 +2657,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             label: an event label
             attrs: an AttributeContainer of frame-level attributes
         '''
-        self._ensure_has_event_label(label)
-        self.schema[label].add_frame_attributes(attrs)
+        self._ensure_has_event_label(label).add_frame_attributes(attrs)
 
     def add_object_label(self, event_label, obj_label):
         '''Adds the given object label for the event with the given label to
@@ -2367,8 +2667,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             event_label: an event label
             obj_label: an object label
         '''
-        self._ensure_has_event_label(event_label)
-        self.schema[event_label].add_object_label(obj_label)
+        self._ensure_has_event_label(event_label).add_object_label(obj_label)
 
     def add_object_attribute(self, event_label, obj_label, attr):
         '''Adds the object-level attribute for the object with the given label
@@ -2379,8 +2678,8 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             obj_label: an object label
             attr: an Attribute
         '''
-        self._ensure_has_event_label(event_label)
-        self.schema[event_label].add_object_attribute(obj_label, attr)
+        self._ensure_has_event_label(event_label).add_object_attribute(
+            obj_label, attr)
 
     def add_object_attributes(self, event_label, obj_label, attrs):
         '''Adds the AttributeContainer of object-level attributes for the
@@ -2392,8 +2691,8 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             obj_label: an object label
             attrs: an AttributeContainer
         '''
-        self._ensure_has_event_label(event_label)
-        self.schema[event_label].add_object_attributes(obj_label, attrs)
+        self._ensure_has_event_label(event_label).add_object_attributes(
+            obj_label, attrs)
 
     def add_object_frame_attribute(self, event_label, obj_label, attr):
         '''Adds the frame-level attribute for the object with the given label
@@ -2404,8 +2703,8 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             obj_label: an object label
             attr: an Attribute
         '''
-        self._ensure_has_event_label(event_label)
-        self.schema[event_label].add_object_frame_attribute(obj_label, attr)
+        self._ensure_has_event_label(event_label).add_object_frame_attribute(
+            obj_label, attr)
 
     def add_object_frame_attributes(self, event_label, obj_label, attrs):
         '''Adds the AttributeContainer of frame-level attributes for the
@@ -2417,8 +2716,8 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             obj_label: an object label
             attrs: an AttributeContainer
         '''
-        self._ensure_has_event_label(event_label)
-        self.schema[event_label].add_object_frame_attributes(obj_label, attrs)
+        self._ensure_has_event_label(event_label).add_object_frame_attributes(
+            obj_label, attrs)
 
     def add_object(self, event_label, obj):
         '''Adds the object to the event with the given label to the schema.
@@ -2427,8 +2726,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             event_label: an event label
             obj: a VideoObject or DetectedObject
         '''
-        self._ensure_has_event_label(event_label)
-        self.schema[event_label].add_object(obj)
+        self._ensure_has_event_label(event_label).add_object(obj)
 
     def add_objects(self, event_label, objects):
         '''Adds the objects to the event with the given label to the schema.
@@ -2437,8 +2735,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             event_label: an event label
             objects: a VideoObjectContainer or DetectedObjectContainer
         '''
-        self._ensure_has_event_label(event_label)
-        self.schema[event_label].add_objects(objects)
+        self._ensure_has_event_label(event_label).add_objects(objects)
 
     def add_event(self, event):
         '''Adds the event to the schema.
@@ -2446,8 +2743,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Args:
             event: a VideoEvent
         '''
-        self._ensure_has_event_label(event.label)
-        self.schema[event.label].add_event(event)
+        self._ensure_has_event_label(event.label).add_event(event)
 
     def add_events(self, events):
         '''Adds the event to the schema.
@@ -2455,8 +2751,9 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Args:
             events: a VideoEventContainer or DetectedEventContainer
         '''
+        ensure_has_event_label = self._ensure_has_event_label
         for event in events:
-            self.add_event(event)
+            ensure_has_event_label(event.label).add_event(event)
 
     def is_valid_event_label(self, label):
         '''Whether the event label is compliant with the schema.
@@ -2467,11 +2764,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        try:
-            self.validate_event_label(label)
-            return True
-        except etal.LabelsSchemaError:
-            return False
+        return label in self.schema
 
     def is_valid_event_attribute(self, label, attr):
         '''Whether the event-level attribute for the event with the given label
@@ -2484,11 +2777,10 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        try:
-            self.validate_event_attribute(label, attr)
-            return True
-        except etal.LabelsSchemaError:
-            return False
+        event_schema = self.schema.get(label, None)
+        return (
+            event_schema is not None and
+            event_schema.is_valid_event_attribute(attr))
 
     def is_valid_event_attributes(self, label, attrs):
         '''Whether the AttributeContainer of event-level attributes for the
@@ -2501,11 +2793,10 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        try:
-            self.validate_event_attributes(label, attrs)
-            return True
-        except etal.LabelsSchemaError:
-            return False
+        event_schema = self.schema.get(label, None)
+        return (
+            event_schema is not None and
+            event_schema.is_valid_event_attributes(attrs))
 
     def is_valid_frame_attribute(self, label, attr):
         '''Whether the frame-level attribute for the event with the given label
@@ -2518,11 +2809,10 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        try:
-            self.validate_frame_attribute(label, attr)
-            return True
-        except etal.LabelsSchemaError:
-            return False
+        event_schema = self.schema.get(label, None)
+        return (
+            event_schema is not None and
+            event_schema.is_valid_frame_attribute(attr))
 
     def is_valid_frame_attributes(self, label, attrs):
         '''Whether the AttributeContainer of frame-level attributes for the
@@ -2535,11 +2825,10 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        try:
-            self.validate_frame_attributes(label, attrs)
-            return True
-        except etal.LabelsSchemaError:
-            return False
+        event_schema = self.schema.get(label, None)
+        return (
+            event_schema is not None and
+            event_schema.is_valid_frame_attributes(attrs))
 
     def is_valid_object_label(self, event_label, obj_label):
         '''Whether the object label for the event with the given label is
@@ -2552,11 +2841,10 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        try:
-            self.validate_object_label(event_label, obj_label)
-            return True
-        except etal.LabelsSchemaError:
-            return False
+        event_schema = self.schema.get(event_label, None)
+        return (
+            event_schema is not None and
+            event_schema.is_valid_object_label(obj_label))
 
     def is_valid_object_attribute(self, event_label, obj_label, attr):
         '''Whether the object-level attribute for the object with the given
@@ -2570,11 +2858,10 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        try:
-            self.validate_object_attribute(event_label, obj_label, attr)
-            return True
-        except etal.LabelsSchemaError:
-            return False
+        event_schema = self.schema.get(event_label, None)
+        return (
+            event_schema is not None and
+            event_schema.is_valid_object_attribute(obj_label, attr))
 
     def is_valid_object_attributes(self, event_label, obj_label, attrs):
         '''Whether the AttributeContainer of object-level attributes for the
@@ -2589,11 +2876,10 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        try:
-            self.validate_object_attributes(event_label, obj_label, attrs)
-            return True
-        except etal.LabelsSchemaError:
-            return False
+        event_schema = self.schema.get(event_label, None)
+        return (
+            event_schema is not None and
+            event_schema.is_valid_object_attributes(obj_label, attrs))
 
     def is_valid_object_frame_attribute(self, event_label, obj_label, attr):
         '''Whether the frame-level attribute for the object with the given
@@ -2607,11 +2893,10 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        try:
-            self.validate_object_frame_attribute(event_label, obj_label, attr)
-            return True
-        except etal.LabelsSchemaError:
-            return False
+        event_schema = self.schema.get(event_label, None)
+        return (
+            event_schema is not None and
+            event_schema.is_valid_object_frame_attribute(obj_label, attr))
 
     def is_valid_object_frame_attributes(self, event_label, obj_label, attrs):
         '''Whether the AttributeContainer of frame-level attributes for the
@@ -2626,12 +2911,10 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        try:
-            self.validate_object_frame_attributes(
-                event_label, obj_label, attrs)
-            return True
-        except etal.LabelsSchemaError:
-            return False
+        event_schema = self.schema.get(event_label, None)
+        return (
+            event_schema is not None and
+            event_schema.is_valid_object_frame_attributes(obj_label, attrs))
 
     def is_valid_object(self, event_label, obj):
         '''Whether the object for the event with the given label is compliant
@@ -2644,11 +2927,8 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        try:
-            self.validate_object(event_label, obj)
-            return True
-        except etal.LabelsSchemaError:
-            return False
+        event_schema = self.schema.get(event_label, None)
+        return event_schema is not None and event_schema.is_valid_object(obj)
 
     def is_valid_objects(self, event_label, objects):
         '''Whether the objects for the event with the given label are compliant
@@ -2661,11 +2941,10 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        try:
-            self.validate_objects(event_label, objects)
-            return True
-        except etal.LabelsSchemaError:
-            return False
+        event_schema = self.schema.get(event_label, None)
+        return (
+            event_schema is not None and
+            event_schema.is_valid_objects(objects))
 
     def is_valid_event(self, event):
         '''Whether the event is compliant with the schema.
@@ -2676,11 +2955,8 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             True/False
         '''
-        try:
-            self.validate_event(event)
-            return True
-        except etal.LabelsSchemaError:
-            return False
+        event_schema = self.schema.get(event.label, None)
+        return event_schema is not None and event_schema.is_valid(event)
 
     def validate_event_label(self, label):
         '''Validates that the event label is compliant with the schema.
@@ -2707,7 +2983,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             LabelsSchemaError: if the attribute is not compliant with the
                 schema
         '''
-        self.validate_event_label(label)
         self.schema[label].validate_event_attribute(attr)
 
     def validate_event_attributes(self, label, attrs):
@@ -2722,7 +2997,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             LabelsSchemaError: if the attributes are not compliant with the
                 schema
         '''
-        self.validate_event_label(label)
         self.schema[label].validate_event_attributes(attrs)
 
     def validate_frame_attribute(self, label, attr):
@@ -2737,7 +3011,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             LabelsSchemaError: if the attribute is not compliant with the
                 schema
         '''
-        self.validate_event_label(label)
         self.schema[label].validate_frame_attribute(attr)
 
     def validate_frame_attributes(self, label, attrs):
@@ -2752,7 +3025,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             LabelsSchemaError: if the attributes are not compliant with the
                 schema
         '''
-        self.validate_event_label(label)
         self.schema[label].validate_frame_attributes(attrs)
 
     def validate_object_label(self, event_label, obj_label):
@@ -2767,7 +3039,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             LabelsSchemaError: if the obect label is not compliant with the
                 schema
         '''
-        self.validate_event_label(event_label)
         self.schema[event_label].validate_object_label(obj_label)
 
     def validate_object_attribute(self, event_label, obj_label, attr):
@@ -2784,7 +3055,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             LabelsSchemaError: if the attribute is not compliant with the
                 schema
         '''
-        self.validate_event_label(event_label)
         self.schema[event_label].validate_object_attribute(obj_label, attr)
 
     def validate_object_attributes(self, event_label, obj_label, attrs):
@@ -2801,7 +3071,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             LabelsSchemaError: if the attributes are not compliant with the
                 schema
         '''
-        self.validate_event_label(event_label)
         self.schema[event_label].validate_object_attributes(obj_label, attrs)
 
     def validate_object_frame_attribute(self, event_label, obj_label, attr):
@@ -2818,7 +3087,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             LabelsSchemaError: if the attribute is not compliant with the
                 schema
         '''
-        self.validate_event_label(event_label)
         self.schema[event_label].validate_object_frame_attribute(
             obj_label, attr)
 
@@ -2836,7 +3104,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             LabelsSchemaError: if the attribute is not compliant with the
                 schema
         '''
-        self.validate_event_label(event_label)
         self.schema[event_label].validate_object_frame_attributes(
             obj_label, attrs)
 
@@ -2851,7 +3118,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Raises:
             LabelsSchemaError: if the object is not compliant with the schema
         '''
-        self.validate_event_label(event_label)
         self.schema[event_label].validate_object(obj)
 
     def validate_objects(self, event_label, objects):
@@ -2865,8 +3131,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Raises:
             LabelsSchemaError: if the object is not compliant with the schema
         '''
-        self.validate_event_label(event_label)
-        self.schema[event_label].validate(objects)
+        self.schema[event_label].validate_objects(objects)
 
     def validate_event(self, event):
         '''Validates that the event is compliant with the schema.
@@ -2877,7 +3142,6 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Raises:
             LabelsSchemaError: if the event is not compliant with the schema
         '''
-        self.validate_event_label(event.label)
         self.schema[event.label].validate(event)
 
     def validate(self, events):
@@ -2889,8 +3153,9 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Raises:
             LabelsSchemaError: if the events are not compliant with the schema
         '''
+        schemas = self.schema
         for event in events:
-            self.validate_event(event)
+            schemas[event.label].validate(event)
 
     def validate_subset_of_schema(self, schema):
         '''Validates that this schema is a subset of the given schema.
@@ -2904,13 +3169,14 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         '''
         self.validate_schema_type(schema)
 
+        other_schemas = schema.schema
         for label, event_schema in iteritems(self.schema):
-            if not schema.has_event_label(label):
+            other_schema = other_schemas.get(label, None)
+            if other_schema is None:
                 raise EventContainerSchemaError(
                     "Event label '%s' does not appear in schema" % label)
 
-            other_event_schema = schema.get_event_schema(label)
-            event_schema.validate_subset_of_schema(other_event_schema)
+            event_schema.validate_subset_of_schema(other_schema)
 
     def merge_event_schema(self, event_schema):
         '''Merges the given `EventSchema` into the schema.
@@ -2919,8 +3185,7 @@ class EventContainerSchema(etal.LabelsContainerSchema):
             event_schema: an EventSchema
         '''
         label = event_schema.label
-        self._ensure_has_event_label(label)
-        self.schema[label].merge_schema(event_schema)
+        self._ensure_has_event_label(label).merge_schema(event_schema)
 
     def merge_schema(self, schema):
         '''Merges the given EventContainerSchema into this schema.
@@ -2928,8 +3193,18 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Args:
             schema: an EventContainerSchema
         '''
-        for _, event_schema in schema.iter_events():
-            self.merge_event_schema(event_schema)
+        self_schemas = self.schema
+        new_schemas = {}
+        for label, event_schema in schema.iter_events():
+            if label in self_schemas:
+                self_schemas[label].merge_schema(event_schema)
+            else:
+                # Copy into a fresh schema so that `schema` is not aliased
+                new_schema = EventSchema(label)
+                new_schema.merge_schema(event_schema)
+                new_schemas[new_schema.label] = new_schema
+
+        self_schemas.update(new_schemas)
 
     @classmethod
     def build_active_schema(cls, events):
@@ -2942,9 +3217,19 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             an EventContainerSchema
         '''
-        schema = cls()
-        schema.add_events(events)
-        return schema
+        # Group the events by label so that each EventSchema is built in one
+        # pass over its events
+        events_map = defaultdict(list)
+        for event in events:
+            events_map[event.label].append(event)
+
+        schema = {}
+        for label, label_events in iteritems(events_map):
+            event_schema = EventSchema(label)
+            event_schema.add_events(label_events)
+            schema[label] = event_schema
+
+        return cls(schema=schema)
 
     @classmethod
     def from_dict(cls, d):
@@ -2956,18 +3241,26 @@ class EventContainerSchema(etal.LabelsContainerSchema):
         Returns:
             an EventContainerSchema
         '''
-        schema = d.get("schema", None)
-        if schema is not None:
-            schema = {
-                label: EventSchema.from_dict(esd)
-                for label, esd in iteritems(schema)
-            }
+        schema = cls()
 
-        return cls(schema=schema)
+        # The parsed event schemas are inserted directly into the interned
+        # dict that `__init__()` would otherwise build from a copy
+        event_schema_dicts = d.get("schema", None)
+        if event_schema_dicts:
+            event_schema_from_dict = EventSchema.from_dict
+            schema.schema = _EventSchemaDict(
+                (_intern(label), event_schema_from_dict(esd))
+                for label, esd in iteritems(event_schema_dicts))
+
+        return schema
 
     def _ensure_has_event_label(self, label):
-        if not self.has_event_label(label):
-            self.schema[label] = EventSchema(label)
+        event_schema = self.schema.get(label, None)
+        if event_schema is None:
+            event_schema = EventSchema(label)
+            self.schema[event_schema.label] = event_schema
+
+        return event_schema
 
 
 class EventContainerSchemaError(etal.LabelsContainerSchemaError):
@@ -2975,10 +3268,25 @@ class EventContainerSchemaError(etal.LabelsContainerSchemaError):
     pass
 
 
+class _EventSchemaDict(dict):
+    '''The dictionary of `EventSchema`s stored by an EventContainerSchema.
+
+    Looking up an unknown event label raises an EventContainerSchemaError, so
+    accessors can validate and fetch an event schema with a single lookup.
+    '''
+
+    def __missing__(self, label):
+        raise EventContainerSchemaError(
+            "Event label '%s' is not allowed by the schema" % label)
+
+
 class VideoEventFrameRenderer(etal.LabelsFrameRenderer):
     '''Class for rendering a VideoEvent at the frame-level.
 
     See the VideoEvent class docstring for the framewise format spec.
+
+    The support of the event is cached the first time it is needed, so the
+    event should not be modified while a renderer is in use.
     '''
 
     _LABELS_CLS = VideoEvent
@@ -2991,6 +3299,9 @@ class VideoEventFrameRenderer(etal.LabelsFrameRenderer):
             event: a VideoEvent
         '''
         self._event = event
+        self._support = None
+        self._objects = None
+        self._obj_renderer = None
 
     def render(self, in_place=False):
         '''Renders the VideoEvent in framewise format.
@@ -3010,7 +3321,7 @@ class VideoEventFrameRenderer(etal.LabelsFrameRenderer):
             event.clear_event_attributes()
             event.clear_video_objects()
             event.clear_detections()
-            event.frames = frames
+            event.frames.update(frames)
             return event
 
         # Render new copy of event
@@ -3037,12 +3348,15 @@ class VideoEventFrameRenderer(etal.LabelsFrameRenderer):
         Returns:
             a DetectedEvent, or None if no labels exist for the given frame
         '''
-        if frame_number not in self._event.support:
+        if frame_number not in self._get_support():
             return None
 
         event_attrs = self._get_event_attrs()
+        metadata = self._get_event_metadata()
         dobjs = self._render_object_frame(frame_number, in_place)
-        return self._render_frame(frame_number, event_attrs, dobjs, in_place)
+        return self._render_frame(
+            frame_number, self._event.frames, event_attrs, dobjs, metadata,
+            in_place)
 
     def render_all_frames(self, in_place=False):
         '''Renders the VideoEvent for all possible frames.
@@ -3054,69 +3368,97 @@ class VideoEventFrameRenderer(etal.LabelsFrameRenderer):
         Returns:
             a dictionary mapping frame numbers to DetectedEvent instances
         '''
+        event = self._event
         event_attrs = self._get_event_attrs()
+        metadata = self._get_event_metadata()
         dobjs_map = self._render_all_object_frames(in_place)
 
+        # The event's fields are looked up once here rather than per frame
+        frames = event.frames
+        render_frame = self._render_frame
+        frame_numbers = sorted(self._get_support())
         devents_map = {}
-        for frame_number in self._event.support:
+        for idx, frame_number in enumerate(frame_numbers, 1):
+            # Each frame needs its own copy of the event-level attributes. The
+            # copy made by `_get_event_attrs()` is given to the last frame
+            if event_attrs is not None and idx < len(frame_numbers):
+                frame_attrs = deepcopy(event_attrs)
+            else:
+                frame_attrs = event_attrs
+
             dobjs = dobjs_map.get(frame_number, None)
-            devents_map[frame_number] = self._render_frame(
-                frame_number, event_attrs, dobjs, in_place)
+            devents_map[frame_number] = render_frame(
+                frame_number, frames, frame_attrs, dobjs, metadata, in_place)
 
         return devents_map
 
-    def _render_frame(self, frame_number, event_attrs, dobjs, in_place):
-        event = self._event
-
+    def _render_frame(
+            self, frame_number, frames, event_attrs, dobjs, metadata,
+            in_place):
         # Base DetectedEvent
-        if frame_number in event.frames:
-            devent = event.frames[frame_number]
-            if not in_place:
-                devent = deepcopy(devent)
-        else:
+        devent = frames.get(frame_number, None)
+        if devent is None:
             devent = DetectedEvent(frame_number=frame_number)
+        elif not in_place:
+            devent = _copy_detected_event(devent)
 
         # Render event-level attributes
         if event_attrs is not None:
             #
             # Prepend event-level attributes
             #
-            # We cannot avoid `deepcopy` here because event-level attributes
-            # must be embedded in each frame
+            # `prepend_container()` stores the attributes by reference, so
+            # callers must pass a copy that is owned by this frame
             #
-            devent.attrs.prepend_container(deepcopy(event_attrs))
+            devent.attrs.prepend_container(event_attrs)
 
         # Render objects
         if dobjs is not None:
             devent.add_objects(dobjs)
 
         # Inherit available event-level metadata
-        if event.label is not None:
-            devent.label = event.label
-        if event.confidence is not None:
-            devent.confidence = event.confidence
-        if event.index is not None:
-            devent.index = event.index
+        for name, value in metadata:
+            setattr(devent, name, value)
 
         return devent
 
-    def _render_all_object_frames(self, in_place):
-        event = self._event
+    def _get_support(self):
+        # The support is computed at most once, as a set of frame numbers so
+        # that membership tests are O(1)
+        if self._support is None:
+            self._support = frozenset(self._event.support.to_list())
 
-        if not event.has_video_objects:
+        return self._support
+
+    def _render_all_object_frames(self, in_place):
+        r = self._get_object_renderer()
+        if r is None:
             return {}
 
-        r = etao.VideoObjectContainerFrameRenderer(event.objects)
         return r.render_all_frames(in_place=in_place)
 
     def _render_object_frame(self, frame_number, in_place):
+        r = self._get_object_renderer()
+        if r is None:
+            return None
+
+        return r.render_frame(frame_number, in_place=in_place)
+
+    def _get_object_renderer(self):
         event = self._event
 
         if not event.has_video_objects:
             return None
 
-        r = etao.VideoObjectContainerFrameRenderer(event.objects)
-        return r.render_frame(frame_number, in_place=in_place)
+        # Reuse the renderer across `render_frame()` calls, as long as the
+        # event's objects have not been replaced
+        objects = event.objects
+        if objects is not self._objects:
+            self._objects = objects
+            self._obj_renderer = etao.VideoObjectContainerFrameRenderer(
+                objects)
+
+        return self._obj_renderer
 
     def _get_event_attrs(self):
         event = self._event
@@ -3125,13 +3467,24 @@ class VideoEventFrameRenderer(etal.LabelsFrameRenderer):
             return None
 
         # There's no need to avoid `deepcopy` here when `in_place == True`
-        # because copies of event-level attributes must be made for each frame
+        # because copies of event-level attributes must be made for each frame.
+        # The copy returned here can be used directly by one frame
         event_attrs = deepcopy(event.attrs)
         for attr in event_attrs:
             attr.constant = True
 
         return event_attrs
 
+    def _get_event_metadata(self):
+        # Returns the (name, value) pairs of the available event-level metadata
+        event = self._event
+        return tuple(
+            (name, value) for name, value in (
+                ("label", event.label),
+                ("confidence", event.confidence),
+                ("index", event.index))
+            if value is not None)
+
 
 class VideoEventContainerFrameRenderer(etal.LabelsContainerFrameRenderer):
     '''Class for rendering labels for a VideoEventContainer at the frame-level.
@@ -3240,3 +3593,252 @@ def strip_spatiotemporal_content_from_events(events):
     objects = etao.VideoObjectContainer.from_detections(dobjs)
 
     return attrs, objects
+
+
+class _FrameDict(dict):
+    '''A dictionary keyed by frame number that caches its keys in sorted
+    order, along with the runs of consecutive frame numbers that they form.
+
+    The cached values are recomputed lazily only after the set of keys
+    changes, so repeatedly iterating over the frames of a `VideoEvent` in
+    order or computing its support does not require a sort each time.
+    '''
+
+    def __init__(self, *args, **kwargs):
+        super(_FrameDict, self).__init__(*args, **kwargs)
+        self._sorted_keys = None
+        self._ranges = None
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._reset()
+
+        super(_FrameDict, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super(_FrameDict, self).__delitem__(key)
+        self._reset()
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    def clear(self):
+        super(_FrameDict, self).clear()
+        self._reset()
+
+    def pop(self, *args):
+        self._reset()
+        return super(_FrameDict, self).pop(*args)
+
+    def popitem(self):
+        self._reset()
+        return super(_FrameDict, self).popitem()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._reset()
+
+        return super(_FrameDict, self).setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self._reset()
+        super(_FrameDict, self).update(*args, **kwargs)
+
+    def sorted_keys(self):
+        '''Returns the list of frame numbers in sorted order.
+
+        The returned list must not be modified.
+
+        Returns:
+            a sorted list of frame numbers
+        '''
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self.keys())
+
+        return self._sorted_keys
+
+    def ranges(self):
+        '''Returns the runs of consecutive frame numbers in the dictionary.
+
+        The returned list must not be modified.
+
+        Returns:
+            a list of (first, last) tuples
+        '''
+        if self._ranges is None:
+            self._ranges = _frame_numbers_to_ranges(
+                np.array(self.sorted_keys(), dtype=np.int64))
+
+        return self._ranges
+
+    def _reset(self):
+        self._sorted_keys = None
+        self._ranges = None
+
+
+def _sort_by_numeric_attr(container, attr, reverse):
+    # Equivalent to `container.sort_by(attr, reverse=reverse)` for numeric
+    # attributes, but the values are gathered into an array and sorted by
+    # numpy rather than via a Python key function. None values are mapped to
+    # NaN, which `np.argsort()` always puts last
+    elements = container.__elements__
+    values = np.array(
+        [getattr(e, attr) for e in elements], dtype=float)
+    if reverse:
+        values = -values
+
+    inds = np.argsort(values, kind="mergesort")
+    setattr(container, container._ELE_ATTR, [elements[i] for i in inds])
+
+
+def _remove_objects_without_attrs(objects, labels):
+    # Equivalent to `objects.remove_objects_without_attrs(labels=labels)`, but
+    # filters the elements directly rather than via `filter_elements()`
+    elements = [
+        obj for obj in objects.__elements__
+        if (labels is not None and obj.label not in labels)
+        or obj.has_attributes]
+    setattr(objects, objects._ELE_ATTR, elements)
+
+
+def _frame_numbers_to_ranges(frame_numbers):
+    # Converts an array of frame numbers, in any order and possibly with
+    # duplicates, into a list of (first, last) tuples describing its runs
+    frame_numbers = np.unique(frame_numbers)
+    if frame_numbers.size == 0:
+        return []
+
+    breaks = np.flatnonzero(np.diff(frame_numbers) > 1)
+    firsts = np.concatenate((frame_numbers[:1], frame_numbers[breaks + 1]))
+    lasts = np.concatenate((frame_numbers[breaks], frame_numbers[-1:]))
+    return list(zip(firsts.tolist(), lasts.tolist()))
+
+
+def _merge_frame_ranges(ranges):
+    # Merges a list of (first, last) tuples, in any order and possibly
+    # overlapping, into a sorted list of disjoint, non-adjacent runs
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            if last > merged[-1][1]:
+                merged[-1] = (merged[-1][0], last)
+        else:
+            merged.append((first, last))
+
+    return merged
+
+
+_DETECTED_EVENT_CLASSES = {}
+
+
+def _copy_detected_event(devent):
+    # Equivalent to `deepcopy(devent)`, but the string and numeric fields are
+    # shared rather than passed through `deepcopy()`. Subclasses may define
+    # other mutable fields, so they are always deep copied
+    if type(devent) is not DetectedEvent:
+        return deepcopy(devent)
+
+    devent_copy = copy(devent)
+    values = devent_copy.__dict__
+    memo = {}
+    for key in _DETECTED_EVENT_MUTABLE_FIELDS:
+        value = values[key]
+        if value is not None:
+            values[key] = deepcopy(value, memo)
+
+    return devent_copy
+
+
+_DETECTED_EVENT_MUTABLE_FIELDS = (
+    "bounding_box", "mask", "top_k_probs", "_attrs", "_objects")
+
+
+def _is_detected_event(event):
+    # Equivalent to `isinstance(event, DetectedEvent)`, but the MRO of each
+    # class is only inspected once, which matters when adding or validating
+    # many events against a schema
+    cls = event.__class__
+    try:
+        return _DETECTED_EVENT_CLASSES[cls]
+    except KeyError:
+        is_detected = issubclass(cls, DetectedEvent)
+        _DETECTED_EVENT_CLASSES[cls] = is_detected
+        return is_detected
+
+
+def _get_attribute_key(attr):
+    # Returns a hashable key that determines whether the attribute is valid
+    # with respect to a schema, or None if the attribute's value is unhashable
+    key = (attr.constant, attr.__class__, attr.name, attr.value)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
+
+
+def _get_type(obj):
+    # The fully-qualified class name is computed once per class and cached on
+    # the class itself, since it is needed every time a label is constructed.
+    # The name is interned so that it is shared with equal strings elsewhere,
+    # e.g., the `type` fields of deserialized labels
+    cls = obj.__class__
+    try:
+        return cls.__dict__["_TYPE"]
+    except KeyError:
+        cls._TYPE = _intern(etau.get_class_name(cls))
+        return cls._TYPE
+
+
+def _intern(s):
+    # Labels are drawn from small vocabularies, so interning them lets all
+    # equal labels share one string, and schema lookups by label can then
+    # match on identity before comparing characters. Python 2 can only intern
+    # native `str`s, so other values are returned as-is
+    if s is None:
+        return s
+
+    try:
+        return six.moves.intern(s)
+    except TypeError:
+        return s
+
+
+def _parse_detected_events(event_cls, ds):
+    # Parses a list of `DetectedEvent` JSON dictionaries one field at a time
+    def _parse_field(key, parse_fcn=None):
+        values = [d.get(key, None) for d in ds]
+        if parse_fcn is None:
+            return values
+
+        return [parse_fcn(v) if v is not None else None for v in values]
+
+    # Masks are decoded together so that their headers are only parsed once
+    masks = _parse_field("mask")
+    mask_inds = [idx for idx, mask in enumerate(masks) if mask is not None]
+    decoded_masks = etas.deserialize_numpy_arrays(
+        [masks[idx] for idx in mask_inds])
+    for idx, mask in zip(mask_inds, decoded_masks):
+        masks[idx] = mask
+
+    columns = zip(
+        _parse_field("label"),
+        _parse_field("bounding_box", etag.BoundingBox.from_dict),
+        masks,
+        _parse_field("confidence"),
+        _parse_field("top_k_probs"),
+        _parse_field("index"),
+        _parse_field("frame_number"),
+        _parse_field("attrs", etad.AttributeContainer.from_dict),
+        _parse_field("objects", etao.DetectedObjectContainer.from_dict),
+    )
+
+    return [
+        event_cls(
+            label=label, bounding_box=bounding_box, mask=mask,
+            confidence=confidence, top_k_probs=top_k_probs, index=index,
+            frame_number=frame_number, attrs=attrs, objects=objects)
+        for (label, bounding_box, mask, confidence, top_k_probs, index,
+             frame_number, attrs, objects) in columns
+    ]
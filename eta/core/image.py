@@ -34,6 +34,7 @@ import cv2
 import numpy as np
 
 import eta
+import eta.core.data as etad
 from eta.core.frames import FrameLabels, FrameLabelsSchema
 import eta.core.labels as etal
 import eta.core.serial as etas
@@ -234,9 +235,16 @@ class ImageSetLabels(etal.LabelsSet):
     ImageLabels without filenames may be added to the set, but they cannot be
     accessed by `filename`-based lookup.
 
+    ImageSetLabels can optionally store a MaskIndex that is shared by all
+    images in the set. When serialized, the shared MaskIndex is stored once
+    at the set level rather than in each ImageLabels that references it, and
+    it is assigned to each ImageLabels without a MaskIndex when loaded.
+
     Attributes:
         images: an OrderedDict of ImageLabels with filenames as keys
         schema: an ImageLabelsSchema describing the schema of the labels
+        mask_index: a MaskIndex describing the semantics of the segmentation
+            masks of the images in the set
     '''
 
     _ELE_ATTR = "images"
@@ -244,6 +252,23 @@ class ImageSetLabels(etal.LabelsSet):
     _ELE_CLS = ImageLabels
     _ELE_CLS_FIELD = "_LABELS_CLS"
 
+    def __init__(self, mask_index=None, **kwargs):
+        '''Creates an ImageSetLabels instance.
+
+        Args:
+            mask_index: (optional) a MaskIndex describing the semantics of the
+                segmentation masks of the images in the set
+            **kwargs: valid keyword arguments for
+                `eta.core.labels.LabelsSet()`
+        '''
+        self.mask_index = mask_index
+        super(ImageSetLabels, self).__init__(**kwargs)
+
+    @property
+    def has_mask_index(self):
+        '''Whether this instance has a set-level MaskIndex.'''
+        return self.mask_index is not None
+
     def sort_by_filename(self, reverse=False):
         '''Sorts the ImageLabels in this instance by filename.
 
@@ -285,6 +310,58 @@ class ImageSetLabels(etal.LabelsSet):
         for image_labels in self:
             image_labels.remove_objects_without_attrs(labels=labels)
 
+    def attributes(self):
+        '''Returns the list of class attributes that will be serialized.
+
+        Returns:
+            a list of attribute names
+        '''
+        _attrs = super(ImageSetLabels, self).attributes()
+        if self.has_mask_index:
+            _attrs.append("mask_index")
+
+        return _attrs
+
+    def serialize(self, reflective=False):
+        '''Serializes the ImageSetLabels into a dictionary.
+
+        Any ImageLabels whose MaskIndex is the set-level MaskIndex do not
+        serialize their own copy of it.
+
+        Args:
+            reflective: whether to include reflective attributes when
+                serializing the object. By default, this is False
+
+        Returns:
+            a JSON dictionary representation of the ImageSetLabels
+        '''
+        d = super(ImageSetLabels, self).serialize(reflective=reflective)
+        if self.has_mask_index:
+            for image_labels, ild in zip(self, d[self._ELE_ATTR]):
+                if image_labels.mask_index is self.mask_index:
+                    ild.pop("mask_index", None)
+
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        '''Constructs an ImageSetLabels from a JSON dictionary.
+
+        Args:
+            d: a JSON dictionary
+
+        Returns:
+            an ImageSetLabels
+        '''
+        image_set_labels = super(ImageSetLabels, cls).from_dict(d)
+
+        mask_index = d.get("mask_index", None)
+        if mask_index is not None:
+            image_set_labels.mask_index = etad.MaskIndex.from_dict(mask_index)
+            image_set_labels._share_mask_index()
+
+        return image_set_labels
+
     @classmethod
     def from_image_labels_patt(cls, image_labels_patt):
         '''Creates an ImageSetLabels from a pattern of ImageLabels files.
@@ -298,6 +375,11 @@ class ImageSetLabels(etal.LabelsSet):
         '''
         return cls.from_labels_patt(image_labels_patt)
 
+    def _share_mask_index(self):
+        for image_labels in self:
+            if not image_labels.has_mask_index:
+                image_labels.mask_index = self.mask_index
+
 
 class BigImageSetLabels(ImageSetLabels, etas.BigSet):
     '''An `eta.core.serial.BigSet` of ImageLabels.
@@ -320,7 +402,9 @@ class BigImageSetLabels(ImageSetLabels, etas.BigSet):
             are/will be stored
     '''
 
-    def __init__(self, images=None, schema=None, backing_dir=None):
+    def __init__(
+            self, images=None, schema=None, mask_index=None,
+            backing_dir=None):
         '''Creates a BigImageSetLabels instance.
 
         Args:
@@ -328,13 +412,31 @@ class BigImageSetLabels(ImageSetLabels, etas.BigSet):
                 elements in the set
             schema: an optional ImageLabelsSchema to enforce on the object.
                 By default, no schema is enforced
+            mask_index: (optional) a MaskIndex describing the semantics of the
+                segmentation masks of the images in the set
             backing_dir: an optional backing directory in which the ImageLabels
                 are/will be stored. If omitted, a temporary backing directory
                 is used
         '''
         self.schema = schema
+        self.mask_index = mask_index
         etas.BigSet.__init__(self, backing_dir=backing_dir, images=images)
 
+    def serialize(self, reflective=False):
+        '''Serializes the BigImageSetLabels into a dictionary.
+
+        The ImageLabels in the set are stored individually in the backing
+        directory, so they keep their own MaskIndex, if any.
+
+        Args:
+            reflective: whether to include reflective attributes when
+                serializing the object. By default, this is False
+
+        Returns:
+            a JSON dictionary representation of the BigImageSetLabels
+        '''
+        return etas.BigSet.serialize(self, reflective=reflective)
+
     def empty_set(self):
         '''Returns an empty in-memory ImageSetLabels version of this
         BigImageSetLabels.
@@ -369,6 +471,10 @@ class BigImageSetLabels(ImageSetLabels, etas.BigSet):
             image_labels.remove_objects_without_attrs(labels=labels)
             self[key] = image_labels
 
+    def _share_mask_index(self):
+        # The ImageLabels on disk always store their own MaskIndex, if any
+        pass
+
 
 def decode(b, include_alpha=False, flag=None):
     '''Decodes an image from raw bytes.
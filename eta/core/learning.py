@@ -16,12 +16,13 @@ from builtins import *
 # pragma pylint: enable=unused-wildcard-import
 # pragma pylint: enable=wildcard-import
 
+from copy import deepcopy
 import logging
 
 import numpy as np
 
 from eta.core.config import Config, ConfigError, Configurable
-import eta.core.models as etam
+import eta.core.data as etad
 import eta.core.utils as etau
 
 
@@ -47,12 +48,13 @@ def load_labels_map(labels_map_path):
     Returns:
         a dictionary mapping indexes to label strings
     '''
-    labels_map = {}
     with open(labels_map_path, "r") as f:
-        for line in f:
-            idx, label = line.split(":")
-            labels_map[int(idx)] = label.strip()
-    return labels_map
+        lines = f.read().splitlines()
+
+    return {
+        int(idx): label.strip()
+        for idx, _, label in (line.partition(":") for line in lines)
+    }
 
 
 def write_labels_map(labels_map, outpath):
@@ -74,8 +76,8 @@ def write_labels_map(labels_map, outpath):
         outpath: the output path
     '''
     with open(outpath, "w") as f:
-        for idx in sorted(labels_map):
-            f.write("%s:%s\n" % (idx, labels_map[idx]))
+        f.write("".join(
+            "%s:%s\n" % (idx, labels_map[idx]) for idx in sorted(labels_map)))
 
 
 def get_class_labels(labels_map):
@@ -110,6 +112,12 @@ def has_default_deployment_model(model_name):
     Returns:
         True/False whether the model has a default deployment
     '''
+    #
+    # @note(lite) import this locally to avoid importing `eta.core.models`,
+    # which pulls in the storage and web clients, unless necessary
+    #
+    import eta.core.models as etam
+
     model = etam.get_model(model_name)
     return model.default_deployment_config_dict is not None
 
@@ -128,6 +136,12 @@ def load_default_deployment_model(model_name):
         the loaded `Model` instance described by the default deployment for the
             specified model
     '''
+    #
+    # @note(lite) import this locally to avoid importing `eta.core.models`,
+    # which pulls in the storage and web clients, unless necessary
+    #
+    import eta.core.models as etam
+
     model = etam.get_model(model_name)
     config = ModelConfig.from_dict(model.default_deployment_config_dict)
     return config.build()
@@ -160,6 +174,12 @@ class HasDefaultDeploymentConfig(object):
             a copy of `d` with any missing fields populated from the default
                 deployment dictionary for the model
         '''
+        #
+        # @note(lite) import this locally to avoid importing `eta.core.models`,
+        # which pulls in the storage and web clients, unless necessary
+        #
+        import eta.core.models as etam
+
         model = etam.get_model(model_name)
         deploy_config_dict = model.default_deployment_config_dict
         if deploy_config_dict is None:
@@ -171,7 +191,9 @@ class HasDefaultDeploymentConfig(object):
         logger.info(
             "Loaded default deployment config for model '%s'", model_name)
 
-        dd = deploy_config_dict["config"]
+        # Copy the defaults so that the model's deployment config dictionary is
+        # not modified
+        dd = dict(deploy_config_dict["config"])
         dd.update(d)
         logger.info(
             "Applied %d setting(s) from default deployment config",
@@ -190,9 +212,15 @@ class ModelConfig(Config):
             `Model` subclass
     '''
 
+    # Cache of (Model class, Config class) tuples, keyed by `type` string
+    _MODEL_CLASSES = {}
+
+    # Cache of default configs, keyed by Config class
+    _DEFAULT_CONFIGS = {}
+
     def __init__(self, d):
         self.type = self.parse_string(d, "type")
-        self._model_cls, self._config_cls = Configurable.parse(self.type)
+        self._model_cls, self._config_cls = self._parse_type(self.type)
         self.config = self.parse_object(
             d, "config", self._config_cls, default=None)
         if not self.config:
@@ -207,13 +235,33 @@ class ModelConfig(Config):
         '''
         return self._model_cls(self.config)
 
+    @classmethod
+    def _parse_type(cls, model_type):
+        # Resolving the classes imports their module by name, so it is done
+        # once per `type` string
+        classes = cls._MODEL_CLASSES.get(model_type, None)
+        if classes is None:
+            classes = Configurable.parse(model_type)
+            cls._MODEL_CLASSES[model_type] = classes
+
+        return classes
+
     def _load_default_config(self):
-        try:
-            # Try to load the default config from disk
-            return self._config_cls.load_default()
-        except NotImplementedError:
-            # Try default() instead
-            return self._config_cls.default()
+        # Default configs are loaded once per Config class, and each model
+        # config receives its own copy of the cached instance
+        config_cls = self._config_cls
+        default_config = self._DEFAULT_CONFIGS.get(config_cls, None)
+        if default_config is None:
+            try:
+                # Try to load the default config from disk
+                default_config = config_cls.load_default()
+            except NotImplementedError:
+                # Try default() instead
+                default_config = config_cls.default()
+
+            self._DEFAULT_CONFIGS[config_cls] = default_config
+
+        return deepcopy(default_config)
 
     def _validate_type(self, base_cls):
         if not issubclass(self._model_cls, base_cls):
@@ -1036,20 +1084,36 @@ class ExposesProbabilities(object):
             return None
 
         probs = np.asarray(probs)
-        labels = np.asarray(self.class_labels)
+        labels = self._get_class_labels_array()
 
-        inds = np.argsort(probs, axis=2)
-        num_images = inds.shape[0]
-        num_preds = inds.shape[1]
+        num_images, num_preds = probs.shape[:2]
+        inds = _get_top_k_inds(probs, top_k)
+        num_top_k = inds.shape[2]
 
-        top_k_probs = np.empty((num_images, num_preds), dtype=dict)
-        for i in range(num_images):
-            for j in range(num_preds):
-                probsij = probs[i, j, :]
-                indsij = inds[i, j, :][-top_k:]
-                top_k_probs[i, j] = dict(zip(labels[indsij], probsij[indsij]))
+        # Gather the top-k entries of all predictions as rows of flat arrays,
+        # so that the dictionaries are built in a single loop
+        top_labels = labels[inds].reshape(-1, num_top_k)
+        top_probs = np.take_along_axis(probs, inds, axis=2).reshape(
+            -1, num_top_k)
 
-        return top_k_probs
+        top_k_probs = np.empty(num_images * num_preds, dtype=dict)
+        top_k_probs[:] = [
+            dict(zip(labelsi, probsi))
+            for labelsi, probsi in zip(top_labels, top_probs)]
+
+        return top_k_probs.reshape(num_images, num_preds)
+
+    def _get_class_labels_array(self):
+        # Models typically return the same `class_labels` list on every call,
+        # so its array is reused until a different (or resized) list is seen
+        class_labels = self.class_labels
+        cache = getattr(self, "_class_labels_cache", None)
+        if (cache is None or cache[0] is not class_labels or
+                len(cache[1]) != len(class_labels)):
+            cache = (class_labels, np.asarray(class_labels))
+            self._class_labels_cache = cache
+
+        return cache[1]
 
     @staticmethod
     def ensure_exposes_probabilities(model):
@@ -1070,3 +1134,104 @@ class ExposesProbabilities(object):
             raise ValueError(
                 "Expected %s to expose probabilities, but it does not" %
                 type(model))
+
+
+class PredictionsPool(object):
+    '''A pool of `eta.core.data.AttributeContainer`s that an `ImageClassifier`
+    can use to package its categorical predictions.
+
+    Each prediction is an `eta.core.data.AttributeContainer` holding a single
+    `eta.core.data.CategoricalAttribute`. Containers that are returned to the
+    pool via `release()` are reused by subsequent calls to `package()`, which
+    avoids allocating new objects for every prediction in long-running
+    callers that process many batches.
+
+    Releasing containers hands their ownership back to the pool: the caller
+    must not use or retain them afterwards, since their attributes will be
+    overwritten in place. Only containers that still hold a single
+    `eta.core.data.CategoricalAttribute` with the pool's attribute name are
+    reused; any others are discarded.
+
+    Attributes:
+        attr_name: the name of the attributes in the packaged predictions
+    '''
+
+    def __init__(self, attr_name):
+        '''Creates a PredictionsPool instance.
+
+        Args:
+            attr_name: the name of the attributes in the packaged predictions
+        '''
+        self.attr_name = attr_name
+        self._attrs = []
+
+    def __len__(self):
+        return len(self._attrs)
+
+    def package(self, label, confidence):
+        '''Packages the given prediction, reusing a released container if
+        possible.
+
+        Args:
+            label: the predicted label
+            confidence: the confidence of the prediction
+
+        Returns:
+            an `eta.core.data.AttributeContainer` containing the prediction
+        '''
+        if self._attrs:
+            attrs = self._attrs.pop()
+            attr = attrs.attrs[0]
+            attr.value = label
+            attr.confidence = confidence
+            attr.top_k_probs = None
+            attr.constant = False
+            return attrs
+
+        attrs = etad.AttributeContainer()
+        attrs.add(etad.CategoricalAttribute(
+            self.attr_name, label, confidence=confidence))
+        return attrs
+
+    def release(self, predictions):
+        '''Returns the given predictions to the pool so that their containers
+        can be reused.
+
+        Args:
+            predictions: an iterable of `eta.core.data.AttributeContainer`s
+                returned by `package()`
+        '''
+        for attrs in predictions:
+            if self._is_reusable(attrs):
+                self._attrs.append(attrs)
+
+    def clear(self):
+        '''Discards all released containers.'''
+        self._attrs = []
+
+    def _is_reusable(self, attrs):
+        if not isinstance(attrs, etad.AttributeContainer) or len(attrs) != 1:
+            return False
+
+        attr = attrs.attrs[0]
+        return (
+            type(attr) is etad.CategoricalAttribute and
+            attr.name == self.attr_name)
+
+
+def _get_top_k_inds(probs, top_k):
+    # Returns the indices of the `top_k` largest probabilities along the last
+    # axis of `probs`, in increasing order of probability, i.e., the same
+    # classes as `np.argsort(probs, axis=-1)[..., -top_k:]`. Only the top-k
+    # entries are sorted; the rest are split off via `np.argpartition()`
+    num_classes = probs.shape[-1]
+    if top_k == 1 and num_classes > 0:
+        # The common single best class case needs no sorting at all
+        return np.argmax(probs, axis=-1)[..., np.newaxis]
+
+    if not 0 < top_k < num_classes:
+        return np.argsort(probs, axis=-1)[..., -top_k:]
+
+    inds = np.argpartition(probs, -top_k, axis=-1)[..., -top_k:]
+    order = np.argsort(np.take_along_axis(probs, inds, axis=-1), axis=-1)
+    return np.take_along_axis(inds, order, axis=-1)
@@ -31,10 +31,15 @@ import numbers
 import os
 import pickle as _pickle
 import pprint
+import struct
 from uuid import uuid4
 import zlib
 
 import numpy as np
+try:
+    import orjson  # optional; used to accelerate JSON serialization
+except ImportError:
+    orjson = None
 
 import eta.core.utils as etau
 
@@ -107,7 +112,7 @@ def read_json(path):
         raise ValueError("Unable to parse JSON file '%s'" % path)
 
 
-def write_json(obj, path, pretty_print=False):
+def write_json(obj, path, pretty_print=False, fast=False):
     '''Writes JSON object to file, creating the output directory if necessary.
 
     Args:
@@ -116,24 +121,42 @@ def write_json(obj, path, pretty_print=False):
         path: the output path
         pretty_print: whether to render the JSON in human readable format with
             newlines and indentations. By default, this is False
+        fast: whether to render compact JSON via `orjson`, if it is
+            installed. See `json_to_str()` for details. By default, this is
+            False
     '''
-    s = json_to_str(obj, pretty_print=pretty_print)
+    s = json_to_str(obj, pretty_print=pretty_print, fast=fast)
     etau.ensure_basedir(path)
     with open(path, "wt") as f:
         f.write(s)
 
 
-def json_to_str(obj, pretty_print=True):
+def json_to_str(obj, pretty_print=True, fast=False):
     '''Converts the JSON object to a string.
 
+    When `fast` is True and `orjson` is installed, it is used to render
+    compact JSON, which is considerably faster than the standard library for
+    large objects. Note that its output differs from the default rendering:
+    no whitespace is emitted after separators, floats may be formatted
+    differently (e.g., `1e20` rather than `1e+20`), and non-finite floats are
+    rendered as `null`, so they are not preserved.
+
     Args:
         obj: a JSON dictionary or an instance of a Serializable subclass
         pretty_print: whether to render the JSON in human readable format with
             newlines and indentations. By default, this is True
+        fast: whether to render compact JSON via `orjson`, if it is
+            installed. Only applicable when `pretty_print` is False. By
+            default, this is False
     '''
     if isinstance(obj, Serializable):
         obj = obj.serialize()
 
+    if fast and orjson is not None and not pretty_print:
+        s = _orjson_dumps(obj)
+        if s is not None:
+            return s
+
     kwargs = {"indent": 4} if pretty_print else {}
     s = json.dumps(
         obj, separators=(",", ": "), cls=ETAJSONEncoder, ensure_ascii=False,
@@ -219,6 +242,46 @@ def deserialize_numpy_array(numpy_str):
         return np.load(f)
 
 
+def deserialize_numpy_arrays(numpy_strs):
+    '''Loads a list of serialized numpy arrays from strings.
+
+    This method is equivalent to calling `deserialize_numpy_array()` on each
+    string, but the array headers are only parsed once per distinct
+    header, which is much faster when deserializing many arrays with the same
+    shape and dtype, e.g., the masks of many labels.
+
+    Args:
+        numpy_strs: an iterable of serialized numpy array strings
+
+    Returns:
+        a list of numpy arrays
+    '''
+    headers = {}
+    arrays = []
+    for numpy_str in numpy_strs:
+        bytes_str = zlib.decompress(b64decode(numpy_str.encode("ascii")))
+        header = _get_npy_header(bytes_str)
+        if header in headers:
+            dtype, shape, order = headers[header]
+            array = np.frombuffer(
+                bytes_str, dtype=dtype, offset=len(header)).copy()
+            arrays.append(array.reshape(shape, order=order))
+            continue
+
+        with io.BytesIO(bytes_str) as f:
+            array = np.load(f)
+
+        if array.size > 0:
+            flags = array.flags
+            fortran = flags.f_contiguous and not flags.c_contiguous
+            order = "F" if fortran else "C"
+            headers[header] = (array.dtype, array.shape, order)
+
+        arrays.append(array)
+
+    return arrays
+
+
 class Serializable(object):
     '''Base class for objects that can be serialized in JSON format.
 
@@ -362,17 +425,20 @@ class Serializable(object):
         obj = self.serialize(**kwargs)
         return json_to_str(obj, pretty_print=pretty_print)
 
-    def write_json(self, path, pretty_print=False, **kwargs):
+    def write_json(self, path, pretty_print=False, fast=False, **kwargs):
         '''Serializes the object and writes it to disk.
 
         Args:
             path: the output path
             pretty_print: whether to render the JSON in human readable format
                 with newlines and indentations. By default, this is False
+            fast: whether to render compact JSON via `orjson`, if it is
+                installed. See `json_to_str()` for details. By default, this
+                is False
             **kwargs: optional keyword arguments for `self.serialize()`
         '''
         obj = self.serialize(**kwargs)
-        write_json(obj, path, pretty_print=pretty_print)
+        write_json(obj, path, pretty_print=pretty_print, fast=fast)
 
     @classmethod
     def from_dict(cls, d, *args, **kwargs):
@@ -2798,3 +2864,29 @@ class ETAJSONEncoder(json.JSONEncoder):
         if isinstance(obj, (dt.datetime, dt.date)):
             return obj.isoformat()
         return super(ETAJSONEncoder, self).default(obj)
+
+
+def _orjson_dumps(obj):
+    # Returns None if orjson cannot encode the object, e.g., integers that
+    # exceed 64 bits, so that the caller can fall back to the `json` module,
+    # which also raises the appropriate error for unserializable objects
+    try:
+        s = orjson.dumps(
+            obj, default=ETAJSONEncoder().default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+    except orjson.JSONEncodeError:
+        return None
+
+    return s.decode("utf-8")
+
+
+def _get_npy_header(bytes_str):
+    # Returns the header (magic string, version, and array header) of the given
+    # `.npy` bytes. Version 1.0 headers store their length in 2 bytes, while
+    # later versions use 4 bytes
+    if bytes_str[6:7] == b"\x01":
+        header_len = struct.unpack("<H", bytes_str[8:10])[0] + 10
+    else:
+        header_len = struct.unpack("<I", bytes_str[8:12])[0] + 12
+
+    return bytes_str[:header_len]
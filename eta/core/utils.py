@@ -39,6 +39,7 @@ import itertools as it
 import logging
 import math
 import mimetypes
+from multiprocessing.pool import ThreadPool
 import os
 import pytz
 import random
@@ -372,6 +373,61 @@ def parse_categorical_string(value, choices, ignore_case=True):
     return orig_value
 
 
+def iter_batches(iterable, batch_size):
+    '''Iterates over the given iterable in batches.
+
+    Args:
+        iterable: an iterable
+        batch_size: the maximum number of elements per batch
+
+    Returns:
+        a generator that emits lists of at most `batch_size` elements. Only
+            the last batch may contain fewer than `batch_size` elements
+    '''
+    batch_size = int(batch_size)
+    if batch_size < 1:
+        raise ValueError("Batch size must be positive; found %d" % batch_size)
+
+    iterator = iter(iterable)
+    while True:
+        batch = list(it.islice(iterator, batch_size))
+        if not batch:
+            return
+
+        yield batch
+
+
+def iter_prefetched(iterable):
+    '''Iterates over the given iterable, fetching the next element in a
+    background thread while the caller processes the current one.
+
+    This is useful when producing elements involves I/O, e.g., decoding video
+    frames, that can be overlapped with the work done by the caller. At most
+    one element is fetched ahead of the caller.
+
+    Args:
+        iterable: an iterable
+
+    Returns:
+        a generator that emits the elements of the iterable
+    '''
+    iterator = iter(iterable)
+    sentinel = object()
+    pool = ThreadPool(processes=1)
+    try:
+        result = pool.apply_async(next, (iterator, sentinel))
+        while True:
+            item = result.get()
+            if item is sentinel:
+                return
+
+            result = pool.apply_async(next, (iterator, sentinel))
+            yield item
+    finally:
+        pool.close()
+        pool.join()
+
+
 class FunctionEnum(object):
     '''Base class for enums that support string-based lookup into a set of
     functions.
@@ -1931,6 +1987,13 @@ def list_files(
             files.extend([
                 os.path.relpath(os.path.join(root, f), dir_path)
                 for f in filenames if not f.startswith(".")])
+    elif hasattr(os, "scandir"):
+        # `os.scandir()` reports file types from the directory listing itself,
+        # so no additional `stat()` call is required per entry
+        files = [
+            e.name for e in os.scandir(dir_path)
+            if (not e.name.startswith(".") or include_hidden_files)
+            and e.is_file()]
     else:
         files = [
             f for f in os.listdir(dir_path)
@@ -28,6 +28,8 @@ from builtins import *
 
 import logging
 import os
+import platform
+import threading
 
 import numpy as np
 import tensorflow as tf
@@ -50,12 +52,18 @@ class VGG16Config(Config):
     Attributes:
         model_name: the name of the VGG-16 model to load
         labels_map: path to the labels map to load
+        use_xla: whether to compile the network with the XLA JIT compiler.
+            XLA fuses the convolution, bias and ReLU ops of each layer and
+            caches a specialized executable per input shape, so, e.g.,
+            single-image and batch inference each get their own fixed-shape
+            kernels after their first run. The default is False
     '''
 
     def __init__(self, d):
         self.model_name = self.parse_string(
             d, "model_name", default="vgg16-imagenet")
         self.labels_map = self.parse_string(d, "labels_map", default=None)
+        self.use_xla = self.parse_bool(d, "use_xla", default=False)
 
         if self.labels_map is None:
             self.labels_map = os.path.join(
@@ -74,8 +82,15 @@ class VGG16(Configurable, UsesTFSession):
 
     Instances of this class must either use the context manager interface or
     manually call `close()` when finished to release memory.
+
+    In addition to the layers of the network, the `top_k_probs` and
+    `top_k_inds` tensors provide the `TOP_K` highest probabilities and their
+    class indices, so that callers that do not need the full distribution can
+    avoid transferring it off the device.
     '''
 
+    TOP_K = 5
+
     def __init__(self, config=None, sess=None, imgs=None):
         '''Creates a VGG16 instance.
 
@@ -95,7 +110,8 @@ class VGG16(Configurable, UsesTFSession):
         if config is None:
             config = VGG16Config.default()
         if sess is None:
-            sess = self.make_tf_session()
+            sess = self.make_tf_session(
+                config_proto=self._make_config_proto(config))
         if imgs is None:
             imgs = tf.placeholder(tf.float32, [None, 224, 224, 3])
 
@@ -166,6 +182,52 @@ class VGG16(Configurable, UsesTFSession):
 
         return etai.resize(img, 224, 224)
 
+    @staticmethod
+    def preprocess_batch(imgs, pool=None, out=None):
+        '''Pre-processes the images for evaluation by converting them to a
+        single contiguous 224 x 224 RGB tensor.
+
+        The mean subtraction is performed inside the network, so this method
+        only resizes the images and stacks them into one float32 array that
+        can be fed directly to `evaluate()`.
+
+        Args:
+            imgs: a list (or n x h x w x 3 tensor) of images
+            pool: an optional `multiprocessing.pool.ThreadPool` to use to
+                preprocess the images in parallel
+            out: an optional preallocated m x 224 x 224 x 3 float32 array,
+                m >= n, to write the preprocessed images into
+
+        Returns:
+            an n x 224 x 224 x 3 float32 array, which is a view into `out`
+                when it is provided
+        '''
+        if out is not None:
+            batch = out[:len(imgs)]
+        else:
+            batch = np.empty((len(imgs), 224, 224, 3), dtype=np.float32)
+
+        def _preprocess(idx):
+            batch[idx] = VGG16.preprocess_image(imgs[idx])
+
+        if pool is not None and len(imgs) > 1:
+            pool.map(_preprocess, range(len(imgs)))
+        else:
+            for idx in range(len(imgs)):
+                _preprocess(idx)
+
+        return batch
+
+    @staticmethod
+    def _make_config_proto(config):
+        if not config.use_xla:
+            return None
+
+        config_proto = tf.ConfigProto()
+        config_proto.graph_options.optimizer_options.global_jit_level = (
+            tf.OptimizerOptions.ON_1)
+        return config_proto
+
     def _build_conv_layers(self):
         self.parameters = []
 
@@ -487,7 +549,10 @@ class VGG16(Configurable, UsesTFSession):
             self.parameters += [fc3w, fc3b]
 
     def _build_output_layer(self):
-        self.probs = tf.nn.softmax(self.fc3)
+        self.logits = self.fc3
+        self.probs = tf.nn.softmax(self.logits)
+        self.top_k_probs, self.top_k_inds = tf.nn.top_k(
+            self.probs, k=self.TOP_K)
 
     def _load_model(self, model_name):
         weights = etam.NpzModelWeights(model_name).load()
@@ -495,12 +560,182 @@ class VGG16(Configurable, UsesTFSession):
             self.sess.run(self.parameters[i].assign(weights[k]))
 
 
+class VGG16TFLite(object):
+    '''TensorFlow Lite version of the VGG-16 network with quantized weights.
+
+    The network is built via `VGG16`, converted in-memory to a TFLite model
+    with the requested quantization applied, and then evaluated via a
+    `tf.lite.Interpreter`. Outputs are always returned as float32 arrays.
+
+    The supported quantization modes are:
+
+        - "int8": dynamic range quantization of the weights to 8-bit
+            integers. This mode is only enabled on ARM hosts, where TFLite
+            provides optimized integer kernels; on other hosts "fp16" is used
+            instead
+
+        - "fp16": quantization of the weights to 16-bit floats
+
+    This class requires TensorFlow 1.15 or later, which is the first release
+    that supports post-training float16 quantization in
+    `tf.lite.TFLiteConverter`.
+
+    Unlike `tf.Session`, a TFLite interpreter is not thread-safe, so calls to
+    `evaluate()` are serialized by an internal lock.
+
+    This class mirrors the `num_classes`, `class_labels`, `probs`, `logits`,
+    `top_k_probs`, `top_k_inds`, `fc2l` and `evaluate()` interface of
+    `VGG16`, so it can be used as a drop-in replacement for inference.
+    '''
+
+    QUANTIZATIONS = ("int8", "fp16")
+    MIN_TF_VERSION = "1.15"
+
+    def __init__(self, config=None, quantization="fp16"):
+        '''Creates a VGG16TFLite instance.
+
+        Args:
+            config: an optional VGG16Config instance. If omitted, the default
+                ETA configuration will be used
+            quantization: the quantization mode to use. Supported values are
+                `VGG16TFLite.QUANTIZATIONS`. The default is "fp16"
+        '''
+        if config is None:
+            config = VGG16Config.default()
+
+        if quantization not in self.QUANTIZATIONS:
+            raise ValueError(
+                "Unsupported quantization '%s'; choices are %s" % (
+                    quantization, self.QUANTIZATIONS))
+
+        if not _supports_tflite_quantization():
+            raise RuntimeError(
+                "Quantized VGG-16 models require TensorFlow >= %s, but "
+                "found TensorFlow %s" % (
+                    self.MIN_TF_VERSION, tf.__version__))
+
+        if quantization == "int8" and not _is_arm():
+            logger.warning(
+                "INT8 quantization is only supported on ARM hosts; using "
+                "FP16 quantization instead")
+            quantization = "fp16"
+
+        self.config = config
+        self.quantization = quantization
+
+        labels_map = etal.load_labels_map(self.config.labels_map)
+        self._class_labels = [labels_map[k] for k in sorted(labels_map.keys())]
+        self._num_classes = len(self._class_labels)
+
+        model_content = self._convert_model(config, quantization)
+        self._interpreter = tf.lite.Interpreter(model_content=model_content)
+        self._interpreter.allocate_tensors()
+
+        self._input_idx = self._interpreter.get_input_details()[0]["index"]
+        self._batch_size = 1
+        self._lock = threading.Lock()
+
+        output_details = self._interpreter.get_output_details()
+        self.probs = output_details[0]["index"]
+        self.fc2l = output_details[1]["index"]
+        self.logits = output_details[2]["index"]
+        self.top_k_probs = output_details[3]["index"]
+        self.top_k_inds = output_details[4]["index"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        '''Releases the TFLite interpreter.'''
+        self._interpreter = None
+
+    @property
+    def num_classes(self):
+        '''The number of classes for the model.'''
+        return self._num_classes
+
+    @property
+    def class_labels(self):
+        '''The list of class labels for the model.'''
+        return self._class_labels
+
+    def get_label(self, idx):
+        '''Gets the label for the given output index.
+
+        Args:
+            idx: the zero-based output index
+
+        Returns:
+            the class label string
+        '''
+        return self.class_labels[idx]
+
+    def evaluate(self, imgs, tensors):
+        '''Feed-forward evaluation through the network.
+
+        Args:
+            imgs: an array of size [XXXX, 224, 224, 3] containing image(s) to
+                feed into the network
+            tensors: a list of output tensors to evaluate, i.e., `probs`,
+                `logits`, `top_k_probs`, `top_k_inds` and/or `fc2l`
+
+        Returns:
+            a list of outputs for the requested tensors. The first dimension of
+                each output will be XXXX
+        '''
+        imgs = np.asarray(imgs, dtype=np.float32)
+        with self._lock:
+            if imgs.shape[0] != self._batch_size:
+                self._interpreter.resize_tensor_input(
+                    self._input_idx, list(imgs.shape))
+                self._interpreter.allocate_tensors()
+                self._batch_size = imgs.shape[0]
+
+            self._interpreter.set_tensor(self._input_idx, imgs)
+            self._interpreter.invoke()
+            return [self._interpreter.get_tensor(t) for t in tensors]
+
+    @staticmethod
+    def _convert_model(config, quantization):
+        logger.info(
+            "Converting VGG-16 to TFLite with %s quantization", quantization)
+        with tf.Graph().as_default():
+            imgs = tf.placeholder(tf.float32, [1, 224, 224, 3])
+            with VGG16(config=config, imgs=imgs) as vgg16:
+                converter = tf.lite.TFLiteConverter.from_session(
+                    vgg16.sess, [imgs],
+                    [vgg16.probs, vgg16.fc2l, vgg16.logits,
+                     vgg16.top_k_probs, vgg16.top_k_inds])
+                converter.optimizations = [tf.lite.Optimize.DEFAULT]
+                if quantization == "fp16":
+                    converter.target_spec.supported_types = [tf.float16]
+
+                return converter.convert()
+
+
+def _supports_tflite_quantization():
+    lite = getattr(tf, "lite", None)
+    if lite is None or not hasattr(lite, "Optimize"):
+        return False
+
+    return hasattr(lite.TargetSpec(), "supported_types")
+
+
+def _is_arm():
+    machine = platform.machine().lower()
+    return machine.startswith("arm") or machine.startswith("aarch")
+
+
 class VGG16FeaturizerConfig(VGG16Config):
     '''Configuration settings for a VGG16Featurizer.
 
     Attributes:
         model_name: the name of the VGG-16 model to load
         labels_map: path to the labels map to load
+        use_xla: whether to compile the network with the XLA JIT compiler
     '''
     pass
 
@@ -857,8 +857,7 @@ class VideoLabels(
             attr: an Attribute
             frame_number: the frame number
         '''
-        self._ensure_frame(frame_number)
-        self.frames[frame_number].add_attribute(attr)
+        self._ensure_frame(frame_number).add_attribute(attr)
 
     def add_frame_attributes(self, attrs, frame_number):
         '''Adds the given frame-level attributes to the video.
@@ -867,8 +866,7 @@ class VideoLabels(
             attrs: an AttributeContainer
             frame_number: the frame number
         '''
-        self._ensure_frame(frame_number)
-        self.frames[frame_number].add_attributes(attrs)
+        self._ensure_frame(frame_number).add_attributes(attrs)
 
     def add_object(self, obj, frame_number=None):
         '''Adds the object to the video.
@@ -1145,9 +1143,12 @@ class VideoLabels(
             events=events, schema=schema)
 
     def _ensure_frame(self, frame_number):
-        if not self.has_frame(frame_number):
-            self.frames[frame_number] = VideoFrameLabels(
-                frame_number=frame_number)
+        frame_labels = self.frames.get(frame_number, None)
+        if frame_labels is None:
+            frame_labels = VideoFrameLabels(frame_number=frame_number)
+            self.frames[frame_number] = frame_labels
+
+        return frame_labels
 
     def _add_detected_object(self, obj, frame_number):
         if frame_number is None:
@@ -1159,8 +1160,7 @@ class VideoLabels(
             frame_number = obj.frame_number
 
         obj.frame_number = frame_number
-        self._ensure_frame(frame_number)
-        self.frames[frame_number].add_object(obj)
+        self._ensure_frame(frame_number).add_object(obj)
 
     def _add_detected_objects(self, objects, frame_number):
         for obj in objects:
@@ -1176,8 +1176,7 @@ class VideoLabels(
             frame_number = event.frame_number
 
         event.frame_number = frame_number
-        self._ensure_frame(frame_number)
-        self.frames[frame_number].add_event(event)
+        self._ensure_frame(frame_number).add_event(event)
 
     def _add_detected_events(self, events, frame_number):
         for event in events:
@@ -1192,14 +1191,15 @@ class VideoLabels(
 
             frame_number = frame_labels.frame_number
 
-        if overwrite or not self.has_frame(frame_number):
+        existing = None if overwrite else self.frames.get(frame_number, None)
+        if existing is None:
             if not isinstance(frame_labels, VideoFrameLabels):
                 frame_labels = VideoFrameLabels.from_frame_labels(frame_labels)
 
             frame_labels.frame_number = frame_number
             self.frames[frame_number] = frame_labels
         else:
-            self.frames[frame_number].merge_labels(frame_labels)
+            existing.merge_labels(frame_labels)
 
     def _compute_support(self):
         frame_ranges = etaf.FrameRanges.from_iterable(self.frames.keys())
@@ -3129,7 +3129,8 @@ class FFmpegVideoReader(VideoReader):
     This class uses 1-based indexing for all frame operations.
     '''
 
-    def __init__(self, inpath, frames=None, keyframes_only=False):
+    def __init__(
+            self, inpath, frames=None, keyframes_only=False, in_opts=None):
         '''Creates an FFmpegVideoReader instance.
 
         Args:
@@ -3149,16 +3150,17 @@ class FFmpegVideoReader(VideoReader):
             keyframes_only: whether to only read keyframes. By default, this
                 is False. When this is True, `frames` is interpreted as
                 keyframe numbers
+            in_opts: an optional list of additional input options for ffmpeg,
+                e.g., ["-threads", "0"] to control decoding
         '''
         # Parse args
+        in_opts = list(in_opts) if in_opts else []
         if keyframes_only:
-            in_opts = ["-skip_frame", "nokey", "-vsync", "0"]
-        else:
-            in_opts = None
+            in_opts.extend(["-skip_frame", "nokey", "-vsync", "0"])
 
         self._stream_info = VideoStreamInfo.build_for(inpath)
         self._ffmpeg = FFmpeg(
-            in_opts=in_opts,
+            in_opts=in_opts or None,
             out_opts=[
                 "-vsync", "0",              # never omit frames
                 "-f", 'image2pipe',         # pipe frames to stdout
@@ -3171,6 +3173,26 @@ class FFmpegVideoReader(VideoReader):
         self._open_stream(inpath)
         super(FFmpegVideoReader, self).__init__(inpath, frames)
 
+    @staticmethod
+    def get_decode_threads_opts(num_threads):
+        '''Returns the ffmpeg input options that decode videos with the given
+        number of threads, for use as the `in_opts` of an FFmpegVideoReader.
+
+        Args:
+            num_threads: the number of decoding threads, or None to use
+                ffmpeg's default
+
+        Returns:
+            a list of ffmpeg input options, or None if `num_threads` is None
+        '''
+        if num_threads is None:
+            return None
+
+        # The default `-thread_type` of ffmpeg already enables both frame and
+        # slice threading, so only the thread count is configurable here
+        logger.info("Decoding videos with %d threads", num_threads)
+        return ["-threads", str(int(num_threads))]
+
     def close(self):
         '''Closes the FFmpegVideoReader.'''
         self._ffmpeg.close()
@@ -3227,8 +3249,15 @@ class FFmpegVideoReader(VideoReader):
 
     def _grab(self):
         try:
+            # Read directly into a fresh buffer that the returned frame will
+            # wrap, so that each frame is copied only once
             width, height = self.frame_size
-            self._raw_frame = self._ffmpeg.read(width * height * 3)
+            raw_frame = bytearray(width * height * 3)
+            num_bytes = self._ffmpeg.read_into(raw_frame)
+            if num_bytes < len(raw_frame):
+                raw_frame = raw_frame[:num_bytes]
+
+            self._raw_frame = raw_frame
             return True
         except Exception as e:
             logger.warning(e, exc_info=True)
@@ -3246,7 +3275,7 @@ class FFmpegVideoReader(VideoReader):
 
         width, height = self.frame_size
         try:
-            vec = np.fromstring(self._raw_frame, dtype="uint8")
+            vec = np.frombuffer(self._raw_frame, dtype="uint8")
             return vec.reshape((height, width, 3))
         except ValueError as e:
             # Possible alternative: return all zeros matrix instead
@@ -3890,6 +3919,23 @@ class FFmpeg(object):
             raise FFmpegStreamingError("Not currently output streaming")
         return self._p.stdout.read(num_bytes)
 
+    def read_into(self, buf):
+        '''Reads bytes from ffmpeg's stdout stream into the given buffer.
+
+        Args:
+            buf: a writable bytes-like object, e.g., a `bytearray`
+
+        Returns:
+            the number of bytes read, which is less than `len(buf)` only when
+                the end of the stream was reached
+
+        Raises:
+            FFmpegStreamingError: if output streaming mode is not active
+        '''
+        if not self.is_output_streaming:
+            raise FFmpegStreamingError("Not currently output streaming")
+        return self._p.stdout.readinto(buf)
+
     def close(self):
         '''Closes a streaming ffmpeg program, if necessary.'''
         if self.is_input_streaming or self.is_output_streaming:
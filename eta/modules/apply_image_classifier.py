@@ -26,6 +26,9 @@ import logging
 import os
 import sys
 
+import numpy as np
+import six
+
 from eta.core.config import Config, ConfigError
 import eta.core.datasets as etad
 import eta.core.image as etai
@@ -171,6 +174,11 @@ class ParametersConfig(Config):
             threshold to use when assigning labels
         record_top_k_probs (eta.core.types.Number): [None] the number of top-k
             class probabilities to record for the predictions
+        batch_size (eta.core.types.Number): [16] the number of images or
+            video frames to pass to the classifier at a time
+        decode_threads (eta.core.types.Number): [None] the number of threads
+            that ffmpeg should use to decode videos. Use 0 to let ffmpeg
+            choose. By default, ffmpeg's default decoder settings are used
     '''
 
     def __init__(self, d):
@@ -180,6 +188,9 @@ class ParametersConfig(Config):
             d, "confidence_threshold", default=None)
         self.record_top_k_probs = self.parse_number(
             d, "record_top_k_probs", default=None)
+        self.batch_size = self.parse_number(d, "batch_size", default=16)
+        self.decode_threads = self.parse_number(
+            d, "decode_threads", default=None)
 
 
 def _build_attribute_filter(threshold):
@@ -187,12 +198,19 @@ def _build_attribute_filter(threshold):
         logger.info("Predicting all attributes")
         return lambda attrs: attrs
 
+    threshold = float(threshold)
     logger.info("Returning predictions with confidence >= %f", threshold)
-    attr_filters = [
-        lambda attr: attr.confidence is None
-        or attr.confidence > float(threshold)
-    ]
-    return lambda attrs: attrs.get_matches(attr_filters)
+
+    def attr_filter(attrs):
+        # Equivalent to `attrs.get_matches()`, without the per-attribute
+        # overhead of its generic filter machinery
+        matches = attrs.empty()
+        matches.add_iterable(
+            attr for attr in attrs
+            if attr.confidence is None or attr.confidence > threshold)
+        return matches
+
+    return attr_filter
 
 
 def _apply_image_classifier(config):
@@ -208,13 +226,18 @@ def _apply_image_classifier(config):
     attr_filter = _build_attribute_filter(
         config.parameters.confidence_threshold)
 
+    batch_size = config.parameters.batch_size
+    reader_opts = etav.FFmpegVideoReader.get_decode_threads_opts(
+        config.parameters.decode_threads)
+
     # Process data
     with classifier:
         for data in config.data:
             if data.video_path:
                 logger.info("Processing video '%s'", data.video_path)
                 _process_video(
-                    data, classifier, attr_filter, record_top_k_probs)
+                    data, classifier, attr_filter, record_top_k_probs,
+                    batch_size, reader_opts)
             if data.image_path:
                 logger.info("Processing image '%s'", data.image_path)
                 _process_image(
@@ -222,15 +245,19 @@ def _apply_image_classifier(config):
             if data.images_dir:
                 logger.info("Processing image directory '%s'", data.images_dir)
                 _process_images_dir(
-                    data, classifier, attr_filter, record_top_k_probs)
+                    data, classifier, attr_filter, record_top_k_probs,
+                    batch_size)
             if data.image_dataset_path:
                 logger.info("Processing image dataset '%s'",
                             data.image_dataset_path)
                 _process_image_dataset(
-                    data, classifier, attr_filter, record_top_k_probs)
+                    data, classifier, attr_filter, record_top_k_probs,
+                    batch_size)
 
 
-def _process_video(data, classifier, attr_filter, record_top_k_probs):
+def _process_video(
+        data, classifier, attr_filter, record_top_k_probs, batch_size,
+        reader_opts):
     write_features = data.video_features_dir is not None
 
     if write_features:
@@ -245,22 +272,31 @@ def _process_video(data, classifier, attr_filter, record_top_k_probs):
     else:
         video_labels = etav.VideoLabels()
 
-    # Classify frames of video
-    with etav.FFmpegVideoReader(data.video_path) as vr:
-        for img in vr:
-            logger.debug("Processing frame %d", vr.frame_number)
-
-            # Classify frame
-            attrs = _classify_image(
-                img, classifier, attr_filter, record_top_k_probs)
+    # Classify frames of video in batches
+    with etav.FFmpegVideoReader(data.video_path, in_opts=reader_opts) as vr:
+        # Decode the next batch of frames while the current one is processed
+        frames = ((vr.frame_number, img) for img in vr)
+        batches = etau.iter_batches(frames, batch_size)
+        for batch in etau.iter_prefetched(batches):
+            frame_numbers, imgs = zip(*batch)
+            logger.debug(
+                "Processing frames %d-%d", frame_numbers[0],
+                frame_numbers[-1])
+
+            # Classify frames
+            attrs_list, features = _classify_images(
+                imgs, classifier, attr_filter, record_top_k_probs,
+                write_features)
 
             # Write features, if necessary
             if write_features:
-                fvec = classifier.get_features()
-                features_handler.write_feature(fvec, vr.frame_number)
+                for idx, frame_number in enumerate(frame_numbers):
+                    features_handler.write_feature(
+                        features[idx:(idx + 1)], frame_number)
 
             # Record predictions
-            video_labels.add_frame_attributes(attrs, vr.frame_number)
+            for frame_number, attrs in zip(frame_numbers, attrs_list):
+                video_labels.add_frame_attributes(attrs, frame_number)
 
     logger.info("Writing labels to '%s'", data.output_labels_path)
     video_labels.write_json(data.output_labels_path)
@@ -282,12 +318,13 @@ def _process_image(data, classifier, attr_filter, record_top_k_probs):
 
     # Classsify image
     img = etai.read(data.image_path)
-    attrs = _classify_image(img, classifier, attr_filter, record_top_k_probs)
+    attrs_list, features = _classify_images(
+        [img], classifier, attr_filter, record_top_k_probs, write_features)
+    attrs = attrs_list[0]
 
     # Write features, if necessary
     if write_features:
-        fvec = classifier.get_features()
-        features_handler.write_feature(fvec, data.image_features)
+        features_handler.write_feature(features, data.image_features)
 
     # Record predictions
     image_labels.add_attributes(attrs)
@@ -296,26 +333,31 @@ def _process_image(data, classifier, attr_filter, record_top_k_probs):
     image_labels.write_json(data.output_image_labels_path)
 
 
-def _process_images_dir(data, classifier, attr_filter, record_top_k_probs):
+def _process_images_dir(
+        data, classifier, attr_filter, record_top_k_probs, batch_size):
     # get paths to all images in directory
     filenames = etau.list_files(data.images_dir)
     inpaths = [os.path.join(data.images_dir, fn) for fn in filenames]
 
     _process_image_path_list(
-        data, classifier, attr_filter, record_top_k_probs, inpaths)
+        data, classifier, attr_filter, record_top_k_probs, batch_size,
+        inpaths)
 
 
-def _process_image_dataset(data, classifier, attr_filter, record_top_k_probs):
+def _process_image_dataset(
+        data, classifier, attr_filter, record_top_k_probs, batch_size):
     # get paths to all images in dataset
     dataset = etad.LabeledImageDataset(data.image_dataset_path)
     inpaths = list(dataset.iter_data_paths())
 
     _process_image_path_list(
-        data, classifier, attr_filter, record_top_k_probs, inpaths)
+        data, classifier, attr_filter, record_top_k_probs, batch_size,
+        inpaths)
 
 
 def _process_image_path_list(
-        data, classifier, attr_filter, record_top_k_probs, inpaths):
+        data, classifier, attr_filter, record_top_k_probs, batch_size,
+        inpaths):
     write_features = data.image_set_features_dir is not None
 
     if write_features:
@@ -332,43 +374,87 @@ def _process_image_path_list(
     else:
         image_set_labels = etai.ImageSetLabels()
 
-    # Classify images in directory
-    for inpath in inpaths:
-        logger.info("Processing image '%s'", inpath)
-        filename = os.path.basename(inpath)
-
-        # Classify image
-        img = etai.read(inpath)
-        attrs = _classify_image(
-            img, classifier, attr_filter, record_top_k_probs)
+    # Classify images in batches, reading the next batch from disk while the
+    # current one is processed
+    batches = (
+        (batch, [etai.read(inpath) for inpath in batch])
+        for batch in etau.iter_batches(inpaths, batch_size))
+    for batch, imgs in etau.iter_prefetched(batches):
+        filenames = []
+        for inpath in batch:
+            logger.info("Processing image '%s'", inpath)
+            filenames.append(os.path.basename(inpath))
+
+        # Classify images
+        attrs_list, features = _classify_images(
+            imgs, classifier, attr_filter, record_top_k_probs,
+            write_features)
 
         # Write features, if necessary
         if write_features:
-            fvec = classifier.get_features()
-            features_handler.write_feature(fvec, filename)
+            for idx, filename in enumerate(filenames):
+                features_handler.write_feature(
+                    features[idx:(idx + 1)], filename)
 
         # Record predictions
-        image_set_labels[filename].add_attributes(attrs)
-
+        for filename, attrs in zip(filenames, attrs_list):
+            image_set_labels[filename].add_attributes(attrs)
 
     logger.info("Writing labels to '%s'", data.output_image_set_labels_path)
     image_set_labels.write_json(data.output_image_set_labels_path)
 
 
-def _classify_image(img, classifier, attr_filter, record_top_k_probs):
-    # Perform prediction
-    attrs = classifier.predict(img)
+def _classify_images(
+        imgs, classifier, attr_filter, record_top_k_probs, write_features):
+    if _implements_predict_all(classifier):
+        # Perform prediction on the whole batch
+        attrs_list = classifier.predict_all(list(imgs))
+        features = classifier.get_features() if write_features else None
+        if record_top_k_probs:
+            all_top_k_probs = classifier.get_top_k_classes(record_top_k_probs)
+    else:
+        # The default `predict_all()` calls `predict()` on each image, after
+        # which the classifier only exposes features and probabilities for
+        # the last image, so they must be collected one image at a time
+        attrs_list = []
+        features = [] if write_features else None
+        all_top_k_probs = []
+        for img in imgs:
+            attrs_list.append(classifier.predict(img))
+            if write_features:
+                features.append(classifier.get_features())
+            if record_top_k_probs:
+                all_top_k_probs.extend(
+                    classifier.get_top_k_classes(record_top_k_probs))
+
+        if write_features:
+            features = np.concatenate(features, axis=0)
+
+    if write_features and len(features) != len(imgs):
+        raise ValueError(
+            "Expected features for %d images, but found %d" %
+            (len(imgs), len(features)))
 
     # Record top-k classes, if necessary
     if record_top_k_probs:
-        all_top_k_probs = classifier.get_top_k_classes(record_top_k_probs)
-        for attr, top_k_probs in zip(attrs, all_top_k_probs.flatten()):
-            attr.top_k_probs = top_k_probs
+        if len(all_top_k_probs) != len(imgs):
+            raise ValueError(
+                "Expected top-k probabilities for %d images, but found %d" %
+                (len(imgs), len(all_top_k_probs)))
+
+        for attrs, top_k_probs_list in zip(attrs_list, all_top_k_probs):
+            for attr, top_k_probs in zip(attrs, top_k_probs_list):
+                attr.top_k_probs = top_k_probs
 
     # Filter predictions
-    attrs = attr_filter(attrs)
+    return [attr_filter(attrs) for attrs in attrs_list], features
+
 
-    return attrs
+def _implements_predict_all(classifier):
+    predict_all = six.get_unbound_function(type(classifier).predict_all)
+    default_predict_all = six.get_unbound_function(
+        etal.ImageClassifier.predict_all)
+    return predict_all is not default_predict_all
 
 
 def run(config_path, pipeline_config_path=None):
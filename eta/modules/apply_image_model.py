@@ -162,9 +162,11 @@ def _process_video(data, model):
         video_labels = etav.VideoLabels()
 
     # Apply model to frames of video
+    debug = logger.isEnabledFor(logging.DEBUG)
     with etav.FFmpegVideoReader(data.video_path) as vr:
         for img in vr:
-            logger.debug("Processing frame %d", vr.frame_number)
+            if debug:
+                logger.debug("Processing frame %d", vr.frame_number)
 
             # Apply model to frame
             image_labels = model.process(img)
@@ -129,6 +129,11 @@ class ParametersConfig(Config):
             `eta.core.learning.ImageSemanticSegmenter` to use
         store_mask_index (eta.core.types.Boolean): [False] whether to store the
             MaskIndex of the segmenter in the output labels
+        batch_size (eta.core.types.Number): [16] the number of images or
+            video frames to pass to the segmenter at a time
+        decode_threads (eta.core.types.Number): [None] the number of threads
+            that ffmpeg should use to decode videos. Use 0 to let ffmpeg
+            choose. By default, ffmpeg's default decoder settings are used
     '''
 
     def __init__(self, d):
@@ -136,6 +141,9 @@ class ParametersConfig(Config):
             d, "segmenter", etal.ImageSemanticSegmenterConfig)
         self.store_mask_index = self.parse_bool(
             d, "store_mask_index", default=False)
+        self.batch_size = self.parse_number(d, "batch_size", default=16)
+        self.decode_threads = self.parse_number(
+            d, "decode_threads", default=None)
 
 
 def _apply_image_semantic_segmenter(config):
@@ -147,21 +155,29 @@ def _apply_image_semantic_segmenter(config):
     if store_mask_index:
         etal.ExposesMaskIndex.ensure_exposes_mask_index(segmenter)
 
+    batch_size = config.parameters.batch_size
+    reader_opts = etav.FFmpegVideoReader.get_decode_threads_opts(
+        config.parameters.decode_threads)
+
     # Process videos
     with segmenter:
         for data in config.data:
             if data.video_path:
                 logger.info("Processing video '%s'", data.video_path)
-                _process_video(data, segmenter, store_mask_index)
+                _process_video(
+                    data, segmenter, store_mask_index, batch_size,
+                    reader_opts)
             if data.image_path:
                 logger.info("Processing image '%s'", data.image_path)
                 _process_image(data, segmenter, store_mask_index)
             if data.images_dir:
                 logger.info("Processing image directory '%s'", data.images_dir)
-                _process_images_dir(data, segmenter, store_mask_index)
+                _process_images_dir(
+                    data, segmenter, store_mask_index, batch_size)
 
 
-def _process_video(data, segmenter, store_mask_index):
+def _process_video(
+        data, segmenter, store_mask_index, batch_size, reader_opts):
     # Load labels
     if data.input_labels_path:
         logger.info(
@@ -170,16 +186,24 @@ def _process_video(data, segmenter, store_mask_index):
     else:
         video_labels = etav.VideoLabels()
 
-    # Apply segmenter to frames of video
-    with etav.FFmpegVideoReader(data.video_path) as vr:
-        for img in vr:
-            logger.debug("Processing frame %d", vr.frame_number)
-
-            # Segment frame
-            image_labels = segmenter.segment(img)
-            frame_labels = etav.VideoFrameLabels.from_image_labels(
-                image_labels, vr.frame_number)
-            video_labels.add_frame(frame_labels, overwrite=False)
+    # Apply segmenter to frames of video in batches
+    with etav.FFmpegVideoReader(data.video_path, in_opts=reader_opts) as vr:
+        # Decode the next batch of frames while the current one is processed
+        frames = ((vr.frame_number, img) for img in vr)
+        batches = etau.iter_batches(frames, batch_size)
+        for batch in etau.iter_prefetched(batches):
+            frame_numbers, imgs = zip(*batch)
+            logger.debug(
+                "Processing frames %d-%d", frame_numbers[0],
+                frame_numbers[-1])
+
+            # Segment frames
+            image_labels_list = segmenter.segment_all(list(imgs))
+            for frame_number, image_labels in zip(
+                    frame_numbers, image_labels_list):
+                frame_labels = etav.VideoFrameLabels.from_image_labels(
+                    image_labels, frame_number)
+                video_labels.add_frame(frame_labels, overwrite=False)
 
     # Store MaskIndex, if requested
     if store_mask_index:
@@ -210,7 +234,7 @@ def _process_image(data, segmenter, store_mask_index):
     image_labels.write_json(data.output_image_labels_path)
 
 
-def _process_images_dir(data, segmenter, store_mask_index):
+def _process_images_dir(data, segmenter, store_mask_index, batch_size):
     # Load labels
     if data.input_image_set_labels_path:
         logger.info(
@@ -221,21 +245,26 @@ def _process_images_dir(data, segmenter, store_mask_index):
     else:
         image_set_labels = etai.ImageSetLabels()
 
-    # Segment images in directory
-    for filename in etau.list_files(data.images_dir):
-        inpath = os.path.join(data.images_dir, filename)
-        logger.info("Processing image '%s'", inpath)
-
-        # Segment image
-        img = etai.read(inpath)
-        image_labels = segmenter.segment(img)
-        image_set_labels[filename].merge_labels(image_labels)
+    # Segment images in directory in batches, reading the next batch from
+    # disk while the current one is processed
+    filenames = etau.list_files(data.images_dir)
+    batches = (
+        (batch, [etai.read(os.path.join(data.images_dir, f)) for f in batch])
+        for batch in etau.iter_batches(filenames, batch_size))
+    for batch, imgs in etau.iter_prefetched(batches):
+        for filename in batch:
+            logger.info(
+                "Processing image '%s'",
+                os.path.join(data.images_dir, filename))
+
+        # Segment images
+        image_labels_list = segmenter.segment_all(imgs)
+        for filename, image_labels in zip(batch, image_labels_list):
+            image_set_labels[filename].merge_labels(image_labels)
 
     # Store MaskIndex, if requested
     if store_mask_index:
-        mask_index = segmenter.get_mask_index()
-        for image_labels in image_set_labels:
-            image_labels.mask_index = mask_index
+        image_set_labels.mask_index = segmenter.get_mask_index()
 
     logger.info("Writing labels to '%s'", data.output_image_set_labels_path)
     image_set_labels.write_json(data.output_image_set_labels_path)
@@ -22,6 +22,8 @@ from builtins import *
 # pragma pylint: enable=wildcard-import
 
 import logging
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 import sys
 
 from eta.core.config import Config
@@ -36,6 +38,16 @@ import eta.core.ziputils as etaz
 logger = logging.getLogger(__name__)
 
 
+# Hardware H.264 encoders for each supported ffmpeg `-hwaccel` method. VAAPI
+# encoding requires uploading frames to the device, so it is only used to
+# accelerate decoding
+_HWACCEL_ENCODERS = {
+    "cuda": "h264_nvenc",
+    "vaapi": None,
+    "videotoolbox": "h264_videotoolbox",
+}
+
+
 class FormatVideosConfig(etam.BaseModuleConfig):
     '''Format videos configuration settings.
 
@@ -130,6 +142,20 @@ class ParametersConfig(Config):
             constraint is applied to them
         ffmpeg_out_opts (eta.core.types.Array): [None] An array of ffmpeg
             output options
+        stream_copy (eta.core.types.Boolean): [False] Whether to remux videos
+            whose frame rate and frame size are unchanged into the output
+            container without re-encoding them. Note that the streams are
+            copied as-is, so the output container must support the input
+            codecs
+        num_workers (eta.core.types.Number): [None] The number of videos in
+            a zip file to format in parallel. By default, the number of CPUs
+            on the machine is used
+        hwaccel (eta.core.types.String): [None] An optional ffmpeg hardware
+            acceleration method to use, "cuda", "vaapi", or "videotoolbox".
+            When provided, videos are decoded on the device and, unless
+            `ffmpeg_out_opts` are provided, encoded with the corresponding
+            hardware H.264 encoder. If the method is not available, the CPU
+            is used
     '''
 
     def __init__(self, d):
@@ -140,31 +166,90 @@ class ParametersConfig(Config):
         self.max_size = self.parse_array(d, "max_size", default=None)
         self.ffmpeg_out_opts = self.parse_array(
             d, "ffmpeg_out_opts", default=None)
+        self.stream_copy = self.parse_bool(d, "stream_copy", default=False)
+        self.num_workers = self.parse_number(d, "num_workers", default=None)
+        self.hwaccel = self.parse_categorical(
+            d, "hwaccel", list(_HWACCEL_ENCODERS), default=None)
 
 
 def _format_videos(config):
     parameters = config.parameters
+    hwaccel_opts = _get_hwaccel_opts(parameters.hwaccel)
 
     for data in config.data:
         if data.is_zip:
-            _process_zip(data.input_zip, data.output_zip, parameters)
+            _process_zip(
+                data.input_zip, data.output_zip, parameters, hwaccel_opts)
         else:
-            _process_video(data.input_path, data.output_path, parameters)
+            _process_video(
+                data.input_path, data.output_path, parameters, hwaccel_opts)
+
+
+def _get_hwaccel_opts(hwaccel):
+    if hwaccel is None:
+        return None, None
+
+    try:
+        _, out, _ = etau.communicate(
+            ["ffmpeg", "-hide_banner", "-hwaccels"], decode=True)
+        available = out.split()
+    except OSError:
+        available = []
+
+    if hwaccel not in available:
+        logger.warning(
+            "ffmpeg hardware acceleration method '%s' is not available; "
+            "using the CPU instead", hwaccel)
+        return None, None
+
+    logger.info("Using ffmpeg hardware acceleration method '%s'", hwaccel)
+    in_opts = ["-hwaccel", hwaccel] + etav.FFmpeg.DEFAULT_IN_OPTS
 
+    encoder = _HWACCEL_ENCODERS[hwaccel]
+    if encoder is None:
+        return in_opts, None
 
-def _process_zip(input_zip, output_zip, parameters):
+    # Mirrors `FFmpeg.DEFAULT_VIDEO_OUT_OPTS`, minus the libx264-specific
+    # rate control options
+    out_opts = [
+        "-c:v", encoder, "-pix_fmt", "yuv420p", "-vsync", "0", "-an"]
+    return in_opts, out_opts
+
+
+def _process_zip(input_zip, output_zip, parameters, hwaccel_opts):
     input_paths = etaz.extract_zip(input_zip)
     output_paths = etaz.make_parallel_files(output_zip, input_paths)
 
-    # Iterate over videos
-    for input_path, output_path in zip(input_paths, output_paths):
-        _process_video(input_path, output_path, parameters)
+    # Process videos in parallel. The work is done by ffmpeg subprocesses,
+    # so threads suffice to keep multiple videos in flight
+    num_workers = parameters.num_workers or multiprocessing.cpu_count()
+    num_workers = max(1, min(int(num_workers), len(input_paths)))
+    args_list = [
+        (input_path, output_path, parameters, hwaccel_opts)
+        for input_path, output_path in zip(input_paths, output_paths)]
+    if num_workers > 1:
+        logger.info(
+            "Processing %d videos with %d workers", len(args_list),
+            num_workers)
+        pool = ThreadPool(processes=num_workers)
+        try:
+            pool.map(_process_video_args, args_list)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for args in args_list:
+            _process_video_args(args)
 
     # Collect outputs
     etaz.make_zip(output_zip)
 
 
-def _process_video(input_path, output_path, parameters):
+def _process_video_args(args):
+    _process_video(*args)
+
+
+def _process_video(input_path, output_path, parameters, hwaccel_opts):
     # Parse parameters
     fps = parameters.fps
     max_fps = parameters.max_fps
@@ -172,6 +257,19 @@ def _process_video(input_path, output_path, parameters):
     size = parameters.size
     max_size = parameters.max_size
     ffmpeg_out_opts = parameters.ffmpeg_out_opts
+    stream_copy = parameters.stream_copy
+    hw_in_opts, hw_out_opts = hwaccel_opts
+
+    # When no frame rate or size changes are requested and the format is the
+    # same, the video can be linked without probing it
+    same_format = etav.is_same_video_file_format(input_path, output_path)
+    if same_format and not (fps or max_fps or scale or size or max_size):
+        logger.info(
+            "No frame rate or frame size changes requested and same video "
+            "format detected, so no computation is required. Just linking "
+            "%s to %s", output_path, input_path)
+        _link_video(input_path, output_path)
+        return
 
     # Get video metadata, logging generously
     video_metadata = etav.VideoMetadata.build_for(input_path, verbose=True)
@@ -206,13 +304,22 @@ def _process_video(input_path, output_path, parameters):
     # Handle no-ops efficiently
     same_fps = ifps == ofps
     same_size = osize == isize
-    same_format = etav.is_same_video_file_format(input_path, output_path)
     if same_fps and same_size and same_format:
         logger.info(
             "Same frame rate, frame size, and video format detected, so no "
-            "computation is required. Just symlinking %s to %s",
+            "computation is required. Just linking %s to %s",
             output_path, input_path)
-        etau.symlink_file(input_path, output_path)
+        _link_video(input_path, output_path)
+        return
+
+    if (stream_copy and same_fps and same_size and
+            etav.is_supported_video_file(input_path) and
+            etav.is_supported_video_file(output_path)):
+        logger.info(
+            "Same frame rate and frame size detected, so remuxing '%s' "
+            "without re-encoding", input_path)
+        ffmpeg = etav.FFmpeg(out_opts=(ffmpeg_out_opts or []) + ["-c", "copy"])
+        ffmpeg.run(input_path, output_path)
         return
 
     # ffmpeg requires that height/width be even
@@ -233,10 +340,24 @@ def _process_video(input_path, output_path, parameters):
     else:
         osize = None  # omit unused argument
 
-    ffmpeg = etav.FFmpeg(fps=ofps, size=osize, out_opts=ffmpeg_out_opts)
+    if ffmpeg_out_opts is None and etav.is_supported_video_file(output_path):
+        ffmpeg_out_opts = hw_out_opts
+
+    ffmpeg = etav.FFmpeg(
+        fps=ofps, size=osize, in_opts=hw_in_opts, out_opts=ffmpeg_out_opts)
     ffmpeg.run(input_path, output_path)
 
 
+def _link_video(input_path, output_path):
+    # Prefer a hard link, which consumers that reject symlinks can still read
+    # without copying the video, and fall back to a symlink when the paths
+    # are on different filesystems
+    try:
+        etau.link_file(input_path, output_path)
+    except OSError:
+        etau.symlink_file(input_path, output_path)
+
+
 def run(config_path, pipeline_config_path=None):
     '''Run the format_videos module.
 
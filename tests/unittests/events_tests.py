@@ -0,0 +1,96 @@
+'''
+Unit tests for the `eta.core.events` module.
+
+Copyright 2017-2020, Voxel51, Inc.
+voxel51.com
+'''
+# pragma pylint: disable=redefined-builtin
+# pragma pylint: disable=unused-wildcard-import
+# pragma pylint: disable=wildcard-import
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import *
+# pragma pylint: enable=redefined-builtin
+# pragma pylint: enable=unused-wildcard-import
+# pragma pylint: enable=wildcard-import
+
+import unittest
+
+import numpy as np
+
+import eta.core.data as etad
+import eta.core.events as etae
+import eta.core.geometry as etag
+import eta.core.objects as etao
+
+
+def _make_events():
+    bounding_box = etag.BoundingBox.from_coords(0.1, 0.2, 0.5, 0.6)
+
+    attrs = etad.AttributeContainer()
+    attrs.add(etad.CategoricalAttribute("weather", "rain", confidence=0.7))
+    attrs.add(etad.NumericAttribute("speed", 3.5))
+
+    objects = etao.DetectedObjectContainer()
+    objects.add(etao.DetectedObject(
+        label="car", bounding_box=bounding_box, confidence=0.9, index=2))
+
+    mask = np.arange(12, dtype=np.uint8).reshape(3, 4)
+
+    return [
+        etae.DetectedEvent(),
+        etae.DetectedEvent(label="run", frame_number=1),
+        etae.DetectedEvent(
+            label="run", bounding_box=bounding_box, mask=mask,
+            confidence=0.8, top_k_probs={"run": 0.8, "walk": 0.2}, index=1,
+            frame_number=3, attrs=attrs, objects=objects),
+        etae.DetectedEvent(
+            label="walk", bounding_box=bounding_box,
+            mask=np.asfortranarray(np.eye(5, dtype=bool)), frame_number=4),
+        etae.DetectedEvent(
+            label="walk", mask=np.zeros((0, 3), dtype=np.uint8), index=0),
+    ]
+
+
+class DetectedEventContainerTests(unittest.TestCase):
+
+    def _make_container(self):
+        container = etae.DetectedEventContainer()
+        container.add_iterable(_make_events())
+        return container
+
+    def test_round_trip(self):
+        container = self._make_container()
+        d = container.serialize()
+        container2 = etae.DetectedEventContainer.from_dict(d)
+
+        self.assertEqual(len(container2), len(container))
+        self.assertEqual(container2.serialize(), d)
+
+        for event, event2 in zip(container, container2):
+            self.assertIs(type(event2), etae.DetectedEvent)
+            if event.mask is None:
+                self.assertIsNone(event2.mask)
+            else:
+                self.assertEqual(event2.mask.dtype, event.mask.dtype)
+                np.testing.assert_array_equal(event2.mask, event.mask)
+
+    def test_matches_per_event_parsing(self):
+        d = self._make_container().serialize()
+        events = etae.DetectedEventContainer.from_dict(d)
+        expected = [etae.DetectedEvent.from_dict(ed) for ed in d["events"]]
+
+        self.assertEqual(
+            [event.serialize() for event in events],
+            [event.serialize() for event in expected])
+
+    def test_empty(self):
+        d = etae.DetectedEventContainer().serialize()
+        container = etae.DetectedEventContainer.from_dict(d)
+        self.assertEqual(len(container), 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,111 @@
+'''
+Unit tests for the `eta.core.image` module.
+
+Copyright 2017-2020, Voxel51, Inc.
+voxel51.com
+'''
+# pragma pylint: disable=redefined-builtin
+# pragma pylint: disable=unused-wildcard-import
+# pragma pylint: disable=wildcard-import
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import *
+# pragma pylint: enable=redefined-builtin
+# pragma pylint: enable=unused-wildcard-import
+# pragma pylint: enable=wildcard-import
+
+import unittest
+
+import numpy as np
+
+import eta.core.data as etad
+import eta.core.image as etai
+
+
+def _make_mask_index(labels_map):
+    mask_index = etad.MaskIndex()
+    for value, label in sorted(labels_map.items()):
+        mask_index.add_value(value, etad.CategoricalAttribute("label", label))
+
+    return mask_index
+
+
+class ImageSetLabelsMaskIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.mask_index = _make_mask_index({1: "road", 2: "car"})
+        self.other_mask_index = _make_mask_index({1: "sky"})
+
+    def _make_image_set_labels(self, share):
+        image_set_labels = etai.ImageSetLabels()
+        for filename in ("a.png", "b.png"):
+            image_labels = etai.ImageLabels(
+                filename=filename, mask=np.eye(3, dtype=np.uint8))
+            if share:
+                image_labels.mask_index = self.mask_index
+            else:
+                image_labels.mask_index = _make_mask_index(
+                    {1: "road", 2: "car"})
+
+            image_set_labels.add(image_labels)
+
+        image_set_labels.add(etai.ImageLabels(
+            filename="c.png", mask_index=self.other_mask_index))
+
+        if share:
+            image_set_labels.mask_index = self.mask_index
+
+        return image_set_labels
+
+    def test_serializes_shared_mask_index_once(self):
+        d = self._make_image_set_labels(True).serialize()
+
+        self.assertEqual(d["mask_index"], self.mask_index.serialize())
+        images = d["images"]
+        self.assertNotIn("mask_index", images[0])
+        self.assertNotIn("mask_index", images[1])
+        self.assertEqual(
+            images[2]["mask_index"], self.other_mask_index.serialize())
+
+    def test_round_trip_shares_mask_index(self):
+        image_set_labels = self._make_image_set_labels(True)
+        d = image_set_labels.serialize()
+        image_set_labels2 = etai.ImageSetLabels.from_dict(d)
+
+        mask_index = image_set_labels2.mask_index
+        self.assertEqual(mask_index.serialize(), self.mask_index.serialize())
+        self.assertIs(image_set_labels2["a.png"].mask_index, mask_index)
+        self.assertIs(image_set_labels2["b.png"].mask_index, mask_index)
+        self.assertEqual(
+            image_set_labels2["c.png"].mask_index.serialize(),
+            self.other_mask_index.serialize())
+        self.assertEqual(image_set_labels2.serialize(), d)
+
+    def test_matches_per_image_mask_indexes(self):
+        shared = etai.ImageSetLabels.from_dict(
+            self._make_image_set_labels(True).serialize())
+        per_image = etai.ImageSetLabels.from_dict(
+            self._make_image_set_labels(False).serialize())
+
+        self.assertFalse(per_image.has_mask_index)
+        for filename in ("a.png", "b.png", "c.png"):
+            self.assertEqual(
+                shared[filename].serialize(), per_image[filename].serialize())
+
+    def test_without_set_level_mask_index(self):
+        d = self._make_image_set_labels(False).serialize()
+        self.assertNotIn("mask_index", d)
+        for image_labels_dict in d["images"]:
+            self.assertIn("mask_index", image_labels_dict)
+
+        image_set_labels = etai.ImageSetLabels.from_dict(d)
+        self.assertFalse(image_set_labels.has_mask_index)
+        self.assertIsNot(
+            image_set_labels["a.png"].mask_index,
+            image_set_labels["b.png"].mask_index)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
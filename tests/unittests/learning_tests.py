@@ -0,0 +1,178 @@
+'''
+Unit tests for the `eta.core.learning` module.
+
+Copyright 2017-2020, Voxel51, Inc.
+voxel51.com
+'''
+# pragma pylint: disable=redefined-builtin
+# pragma pylint: disable=unused-wildcard-import
+# pragma pylint: disable=wildcard-import
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import *
+# pragma pylint: enable=redefined-builtin
+# pragma pylint: enable=unused-wildcard-import
+# pragma pylint: enable=wildcard-import
+
+import unittest
+
+import numpy as np
+
+import eta.core.data as etad
+import eta.core.learning as etal
+
+
+class PredictionsPoolTests(unittest.TestCase):
+
+    def _package_all(self, pool, labels, confidences):
+        return [
+            pool.package(label, confidence)
+            for label, confidence in zip(labels, confidences)]
+
+    def test_package(self):
+        pool = etal.PredictionsPool("label")
+        attrs = pool.package("dog", 0.8)
+
+        self.assertIsInstance(attrs, etad.AttributeContainer)
+        self.assertEqual(len(attrs), 1)
+        attr = attrs.attrs[0]
+        self.assertIsInstance(attr, etad.CategoricalAttribute)
+        self.assertEqual(attr.name, "label")
+        self.assertEqual(attr.value, "dog")
+        self.assertEqual(attr.confidence, 0.8)
+
+    def test_concatenation(self):
+        pool = etal.PredictionsPool("label")
+        preds = self._package_all(pool, ["cat", "dog", "dog"], [0.9, 0.8, 0.7])
+
+        combined = [] + preds
+        self.assertNotIn(None, combined)
+        self.assertEqual(
+            [attrs.attrs[0].value for attrs in combined],
+            ["cat", "dog", "dog"])
+
+        accumulated = []
+        for _ in range(2):
+            accumulated = accumulated + preds
+
+        self.assertEqual(len(accumulated), 6)
+        self.assertNotIn(None, accumulated)
+
+    def test_release_reuses_containers(self):
+        pool = etal.PredictionsPool("label")
+        preds = self._package_all(pool, ["cat", "dog"], [0.9, 0.8])
+        preds[1].attrs[0].top_k_probs = {"dog": 0.8}
+
+        pool.release(preds)
+        self.assertEqual(len(pool), 2)
+
+        reused = pool.package("bird", 0.5)
+        self.assertIs(reused, preds[1])
+        attr = reused.attrs[0]
+        self.assertEqual(attr.value, "bird")
+        self.assertEqual(attr.confidence, 0.5)
+        self.assertIsNone(attr.top_k_probs)
+        self.assertEqual(len(pool), 1)
+
+    def test_release_discards_incompatible_containers(self):
+        pool = etal.PredictionsPool("label")
+
+        renamed = etad.AttributeContainer()
+        renamed.add(etad.CategoricalAttribute("other", "cat"))
+
+        extended = pool.package("cat", 0.9)
+        extended.add(etad.CategoricalAttribute("label", "dog"))
+
+        numeric = etad.AttributeContainer()
+        numeric.add(etad.NumericAttribute("label", 1))
+
+        pool.release([renamed, extended, numeric, etad.AttributeContainer()])
+        self.assertEqual(len(pool), 0)
+
+        attrs = pool.package("dog", 0.7)
+        for container in (renamed, extended, numeric):
+            self.assertIsNot(attrs, container)
+
+    def test_clear(self):
+        pool = etal.PredictionsPool("label")
+        pool.release([pool.package("cat", 0.9)])
+        pool.clear()
+        self.assertEqual(len(pool), 0)
+
+
+class _Probabilities(etal.ExposesProbabilities):
+
+    def __init__(self, probs, class_labels):
+        self._probs = probs
+        self._class_labels = class_labels
+
+    @property
+    def exposes_probabilities(self):
+        return True
+
+    @property
+    def num_classes(self):
+        return len(self._class_labels)
+
+    @property
+    def class_labels(self):
+        return self._class_labels
+
+    def get_probabilities(self):
+        return self._probs
+
+
+def _argsort_top_k_inds(probs, top_k):
+    # The full sort that `_get_top_k_inds()` must be equivalent to
+    return np.argsort(probs, axis=-1)[..., -top_k:]
+
+
+class TopKTests(unittest.TestCase):
+
+    def setUp(self):
+        self.probs = np.random.RandomState(0).rand(4, 3, 10)
+
+    def test_top_k_inds(self):
+        for top_k in (1, 2, 5, 9, 10, 11, 0, -1):
+            inds = etal._get_top_k_inds(self.probs, top_k)
+            expected = _argsort_top_k_inds(self.probs, top_k)
+            np.testing.assert_array_equal(inds, expected)
+
+    def test_top_k_inds_with_ties(self):
+        probs = np.array([[[0.25, 0.5, 0.25, 0.0]], [[0.5, 0.0, 0.5, 0.0]]])
+        for top_k in (1, 2, 3, 4):
+            inds = etal._get_top_k_inds(probs, top_k)
+            expected = _argsort_top_k_inds(probs, top_k)
+            np.testing.assert_array_equal(
+                np.take_along_axis(probs, inds, axis=-1),
+                np.take_along_axis(probs, expected, axis=-1))
+
+    def test_top_k_inds_2d(self):
+        probs = self.probs[0]
+        for top_k in (1, 3, 10):
+            np.testing.assert_array_equal(
+                etal._get_top_k_inds(probs, top_k),
+                _argsort_top_k_inds(probs, top_k))
+
+    def test_get_top_k_classes(self):
+        class_labels = ["class-%d" % idx for idx in range(10)]
+        model = _Probabilities(self.probs, class_labels)
+        labels = np.asarray(class_labels)
+
+        for top_k in (1, 3, 10):
+            top_k_probs = model.get_top_k_classes(top_k)
+            self.assertEqual(top_k_probs.shape, (4, 3))
+
+            inds = _argsort_top_k_inds(self.probs, top_k)
+            for i in range(4):
+                for j in range(3):
+                    indsij = inds[i, j]
+                    expected = dict(
+                        zip(labels[indsij], self.probs[i, j, indsij]))
+                    self.assertEqual(top_k_probs[i, j], expected)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
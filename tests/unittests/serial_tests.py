@@ -0,0 +1,93 @@
+'''
+Unit tests for the `eta.core.serial` module.
+
+Copyright 2017-2020, Voxel51, Inc.
+voxel51.com
+'''
+# pragma pylint: disable=redefined-builtin
+# pragma pylint: disable=unused-wildcard-import
+# pragma pylint: disable=wildcard-import
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from builtins import *
+# pragma pylint: enable=redefined-builtin
+# pragma pylint: enable=unused-wildcard-import
+# pragma pylint: enable=wildcard-import
+
+import unittest
+
+import numpy as np
+
+import eta.core.serial as etas
+
+
+class DeserializeNumpyArraysTests(unittest.TestCase):
+
+    def _assert_same_arrays(self, arrays, expected):
+        self.assertEqual(len(arrays), len(expected))
+        for array, expected_array in zip(arrays, expected):
+            self.assertEqual(array.dtype, expected_array.dtype)
+            self.assertEqual(array.shape, expected_array.shape)
+            self.assertEqual(
+                array.flags.f_contiguous, expected_array.flags.f_contiguous)
+            self.assertEqual(
+                array.flags.c_contiguous, expected_array.flags.c_contiguous)
+            np.testing.assert_array_equal(array, expected_array)
+
+    def _check(self, arrays):
+        numpy_strs = [etas.serialize_numpy_array(a) for a in arrays]
+        expected = [etas.deserialize_numpy_array(s) for s in numpy_strs]
+        self._assert_same_arrays(expected, arrays)
+        self._assert_same_arrays(
+            etas.deserialize_numpy_arrays(numpy_strs), expected)
+
+    def test_repeated_headers(self):
+        arrays = [
+            np.full((4, 5), idx, dtype=np.uint8) for idx in range(5)]
+        self._check(arrays)
+
+    def test_mixed_headers(self):
+        arrays = [
+            np.arange(20, dtype=np.uint8).reshape(4, 5),
+            np.ones((4, 5), dtype=bool),
+            np.arange(20, dtype=np.float32).reshape(5, 4),
+            np.arange(20, dtype=np.uint8).reshape(4, 5) * 2,
+            np.arange(6, dtype=np.int64),
+            np.zeros((5, 4), dtype=np.float32),
+        ]
+        self._check(arrays)
+
+    def test_fortran_order(self):
+        arrays = [
+            np.asfortranarray(np.arange(12, dtype=np.int32).reshape(3, 4)),
+            np.arange(12, dtype=np.int32).reshape(3, 4),
+            np.asfortranarray(-np.arange(12, dtype=np.int32).reshape(3, 4)),
+        ]
+        self._check(arrays)
+
+    def test_empty_arrays(self):
+        arrays = [
+            np.zeros((0, 3), dtype=np.uint8),
+            np.zeros((0, 3), dtype=np.uint8),
+            np.zeros(0, dtype=np.float64),
+            np.array(7, dtype=np.int16),
+            np.array(8, dtype=np.int16),
+        ]
+        self._check(arrays)
+        self.assertEqual(etas.deserialize_numpy_arrays([]), [])
+
+    def test_arrays_are_independent(self):
+        numpy_strs = [
+            etas.serialize_numpy_array(np.zeros((2, 2), dtype=np.uint8))
+            for _ in range(2)]
+        arrays = etas.deserialize_numpy_arrays(numpy_strs)
+
+        arrays[1][0, 0] = 1
+        self.assertEqual(arrays[0][0, 0], 0)
+        self.assertEqual(arrays[1][0, 0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)